@@ -1,3 +1,4 @@
+import ipaddress
 import os
 from dotenv import load_dotenv
 
@@ -8,6 +9,10 @@ SARVAM_API_KEY = os.getenv("SARVAM_API_KEY")
 if not SARVAM_API_KEY:
     raise RuntimeError("SARVAM_API_KEY not found in environment")
 
+# Optional override, e.g. to point at a local stand-in server for benchmarks.
+# (The Groq SDK reads GROQ_BASE_URL from the environment by itself.)
+SARVAM_BASE_URL = os.getenv("SARVAM_BASE_URL")
+
 # -------------------------
 # Supported Translation Languages
 # -------------------------
@@ -50,3 +55,187 @@ SUPPORTED_LANGUAGES = {
         "sarvam_code": "gu-IN"
     }
 }
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# -------------------------
+# Language Detection
+# -------------------------
+# Detect the source language locally (Unicode script histogram) instead of
+# sending "auto" to Sarvam, and skip text already in the target language.
+
+LOCAL_LANGUAGE_DETECTION = _env_bool("LOCAL_LANGUAGE_DETECTION", True)
+
+
+# -------------------------
+# Translation Memory
+# -------------------------
+# Sentence-level reuse of earlier translations in translate_pipeline.
+
+TRANSLATION_MEMORY_ENABLED = _env_bool("TRANSLATION_MEMORY_ENABLED", False)
+TRANSLATION_MEMORY_MAX_SEGMENTS = int(os.getenv("TRANSLATION_MEMORY_MAX_SEGMENTS", "50000"))
+
+
+# -------------------------
+# Worker Roles
+# -------------------------
+# Comma-separated route groups this process serves: translation, speech, ocr,
+# llm (or "all"). Stacks for unlisted roles are never imported.
+
+WORKER_ROLES = ("translation", "speech", "ocr", "llm")
+
+
+def _parse_roles(value: str) -> tuple[str, ...]:
+    roles = [role.strip().lower() for role in value.split(",") if role.strip()]
+    if not roles or "all" in roles:
+        return WORKER_ROLES
+    unknown = sorted(set(roles) - set(WORKER_ROLES))
+    if unknown:
+        raise RuntimeError(f"Unknown APP_ROLES {unknown}. Choose from {list(WORKER_ROLES)} or 'all'")
+    return tuple(role for role in WORKER_ROLES if role in roles)
+
+
+APP_ROLES = _parse_roles(os.getenv("APP_ROLES", "all"))
+# Import the enabled roles' service modules at startup instead of on first request
+APP_PRELOAD = _env_bool("APP_PRELOAD", False)
+
+
+# -------------------------
+# Hedged Provider Requests
+# -------------------------
+# When enabled, a provider call that has not returned by the provider's recent
+# HEDGE_PERCENTILE latency is duplicated and the first response wins.
+
+HEDGING_ENABLED = _env_bool("HEDGING_ENABLED", False)
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "0.95"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+HEDGE_MIN_DELAY_SECONDS = float(os.getenv("HEDGE_MIN_DELAY_SECONDS", "0.2"))
+HEDGE_WINDOW_SECONDS = float(os.getenv("HEDGE_WINDOW_SECONDS", "300"))
+# Extra load cap: at most this fraction of primary calls may be hedged
+HEDGE_BUDGET_RATIO = float(os.getenv("HEDGE_BUDGET_RATIO", "0.05"))
+HEDGE_BUDGET_BURST = float(os.getenv("HEDGE_BUDGET_BURST", "5"))
+HEDGE_MAX_WORKERS = int(os.getenv("HEDGE_MAX_WORKERS", "64"))
+
+
+# -------------------------
+# Provider Scheduling
+# -------------------------
+# Fair sharing of provider calls across clients (the client IP, or the
+# X-Client-ID header when TRUST_CLIENT_ID_HEADER is set): weighted fair
+# queuing over SCHEDULER_MAX_CONCURRENCY slots, per-client concurrency and
+# character budgets, and 429 + Retry-After when a call would wait longer
+# than SCHEDULER_MAX_WAIT_SECONDS. Limits apply per process.
+
+def _parse_weights(value: str) -> dict[str, float]:
+    weights = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        client, _, weight = item.partition("=")
+        try:
+            weights[client.strip()] = float(weight)
+        except ValueError:
+            raise RuntimeError(f"Invalid CLIENT_WEIGHTS entry '{item.strip()}'. Use client=weight")
+        if weights[client.strip()] <= 0:
+            raise RuntimeError(f"CLIENT_WEIGHTS entry '{item.strip()}' must be positive")
+    return weights
+
+
+def _parse_networks(value: str) -> tuple:
+    networks = []
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        try:
+            networks.append(ipaddress.ip_network(item.strip(), strict=False))
+        except ValueError:
+            raise RuntimeError(f"Invalid TRUSTED_PROXIES entry '{item.strip()}'. Use an IP or CIDR range")
+    return tuple(networks)
+
+
+SCHEDULER_ENABLED = _env_bool("SCHEDULER_ENABLED", False)
+# Only behind a gateway that sets X-Client-ID itself; otherwise callers could
+# pick a fresh identity (and fresh quotas) per request
+TRUST_CLIENT_ID_HEADER = _env_bool("TRUST_CLIENT_ID_HEADER", False)
+# Reverse proxies / load balancers (IPs or CIDR ranges) whose X-Forwarded-For
+# is believed. Behind a proxy, without this every caller shares the proxy's
+# IP, and so one client's limits.
+TRUSTED_PROXIES = _parse_networks(os.getenv("TRUSTED_PROXIES", ""))
+SCHEDULER_MAX_CONCURRENCY = int(os.getenv("SCHEDULER_MAX_CONCURRENCY", "32"))
+SCHEDULER_MAX_QUEUE = int(os.getenv("SCHEDULER_MAX_QUEUE", "256"))
+SCHEDULER_MAX_WAIT_SECONDS = float(os.getenv("SCHEDULER_MAX_WAIT_SECONDS", "10"))
+CLIENT_MAX_CONCURRENCY = int(os.getenv("CLIENT_MAX_CONCURRENCY", "4"))
+# Calls a client may have waiting; each holds a request thread, so keep this small
+CLIENT_MAX_QUEUED = int(os.getenv("CLIENT_MAX_QUEUED", "4"))
+# Characters per second a client may send to providers (0 = unlimited)
+CLIENT_CHAR_RATE = float(os.getenv("CLIENT_CHAR_RATE", "0"))
+CLIENT_CHAR_BURST = float(os.getenv("CLIENT_CHAR_BURST", "20000"))
+# Relative shares, e.g. "frontend=4,batch-importer=0.5"; unlisted clients weigh 1
+CLIENT_WEIGHTS = _parse_weights(os.getenv("CLIENT_WEIGHTS", ""))
+
+
+# -------------------------
+# Uploads
+# -------------------------
+
+_MB = 1024 * 1024
+
+UPLOAD_BLOCK_SIZE = int(os.getenv("UPLOAD_BLOCK_SIZE", str(_MB)))
+UPLOAD_MAX_BYTES_OCR = int(os.getenv("UPLOAD_MAX_BYTES_OCR", str(25 * _MB)))
+UPLOAD_MAX_BYTES_SPEECH = int(os.getenv("UPLOAD_MAX_BYTES_SPEECH", str(25 * _MB)))
+# Total upload bytes a process will hold in flight before new uploads wait
+UPLOAD_MEMORY_BUDGET_BYTES = int(os.getenv("UPLOAD_MEMORY_BUDGET_BYTES", str(256 * _MB)))
+UPLOAD_BUDGET_WAIT_SECONDS = float(os.getenv("UPLOAD_BUDGET_WAIT_SECONDS", "5"))
+
+
+# -------------------------
+# Result Cache
+# -------------------------
+# Caches translation, LLM and OCR results. With RESULT_CACHE_PATH set, the
+# cache (and the translation memory) live in a SQLite WAL file shared by all
+# worker processes on the box; otherwise each process keeps its own LRU.
+
+RESULT_CACHE_ENABLED = _env_bool("RESULT_CACHE_ENABLED", False)
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH")
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "86400"))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "10000"))
+
+
+# -------------------------
+# OCR Cost Limits
+# -------------------------
+# Optional OCR work beyond one Tesseract pass per image. Each extra page or
+# line is another Tesseract run inside the request, so these are off or
+# capped by default.
+
+# Re-read low-confidence lines of image uploads (see app/services/ocr_layout.py);
+# each weak line costs up to two extra Tesseract calls
+OCR_REFINE_ENABLED = _env_bool("OCR_REFINE_ENABLED", False)
+# Scanned (text-less) PDF pages OCR'd per document, first pages first; 0 = none
+PDF_OCR_MAX_PAGES = int(os.getenv("PDF_OCR_MAX_PAGES", "0"))
+# Threads one OCR job uses for a batch of pages (0 = CPU count). The OCR
+# worker pool defaults this to 1, since its processes already cover the cores.
+OCR_JOB_THREADS = int(os.getenv("OCR_JOB_THREADS", "0"))
+
+
+# -------------------------
+# OCR Worker Pool
+# -------------------------
+# With OCR_WORKER_ADDRESS set, API workers send OCR jobs over a local socket
+# to a pre-forked pool (python -m app.workers.ocr_worker) instead of running
+# Tesseract / OpenCV in the request thread.
+
+OCR_WORKER_ADDRESS = os.getenv("OCR_WORKER_ADDRESS")
+# No default: the pool and the API workers must share a secret (app.serve generates one)
+OCR_WORKER_AUTHKEY = os.getenv("OCR_WORKER_AUTHKEY", "").encode("utf-8")
+OCR_WORKER_PROCESSES = int(os.getenv("OCR_WORKER_PROCESSES", str(os.cpu_count() or 1)))
+OCR_WORKER_TIMEOUT_SECONDS = float(os.getenv("OCR_WORKER_TIMEOUT_SECONDS", "120"))
+
+if OCR_WORKER_ADDRESS and not OCR_WORKER_AUTHKEY:
+    raise RuntimeError("OCR_WORKER_AUTHKEY must be set when OCR_WORKER_ADDRESS is")
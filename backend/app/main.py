@@ -1,17 +1,58 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import APIRouter, FastAPI, UploadFile, File, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from pydantic import BaseModel
-import tempfile
+from contextlib import contextmanager
+import time
 import os
-from app.services.llm_analyzer import analyze_document_ai
 
-
-from app.services.sarvam_wrapper import translate_text, speech_to_text
-from app.services.ocr_service import extract_text_from_document
-from app.services.translation_service import translate_pipeline
-from app.services.llm_service import summarize_text, explain_for_audience
-from app.config import SUPPORTED_LANGUAGES
+# Service modules are imported inside the route handlers: they pull in heavy
+# stacks (Sarvam SDK, Groq, OpenCV, Tesseract, PyMuPDF) that a worker only
+# pays for on first use, or never when its role is disabled (APP_ROLES).
+from app.config import (
+    APP_PRELOAD,
+    APP_ROLES,
+    OCR_WORKER_ADDRESS,
+    SUPPORTED_LANGUAGES,
+    TRUST_CLIENT_ID_HEADER,
+    TRUSTED_PROXIES,
+    UPLOAD_BLOCK_SIZE,
+    UPLOAD_BUDGET_WAIT_SECONDS,
+    UPLOAD_MAX_BYTES_OCR,
+    UPLOAD_MAX_BYTES_SPEECH,
+    UPLOAD_MEMORY_BUDGET_BYTES,
+)
 from app.utils.chunking import chunk_text
+from app.utils.fair_scheduler import Overloaded
+from app.utils.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_FLIGHT,
+    REQUEST_CHUNKS,
+    render_metrics,
+    stage_timer,
+)
+from app.utils.uploads import (
+    AUDIO_KINDS,
+    IMAGE_KINDS,
+    MemoryBudget,
+    UnsupportedUpload,
+    UploadBackpressure,
+    UploadError,
+    UploadTooLarge,
+    save_upload,
+)
+from app.utils.tracing import (
+    CLIENT_ID_HEADER,
+    FORWARDED_FOR_HEADER,
+    REQUEST_ID_HEADER,
+    client_address,
+    new_request_id,
+    reset_client_id,
+    reset_request_id,
+    set_client_id,
+    set_request_id,
+)
 
 # Provider-safe limits (stay under API caps)
 TRANSLATE_MAX_CHARS = 900   # translation APIs
@@ -30,8 +71,93 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[REQUEST_ID_HEADER, "Retry-After"],
 )
 
+
+@app.middleware("http")
+async def observe_requests(request: Request, call_next):
+    """
+    Tag the request with an id (client-supplied X-Request-ID or a fresh one)
+    for provider-call logging and with the client identity (the client IP,
+    read through X-Forwarded-For from TRUSTED_PROXIES, or X-Client-ID when
+    TRUST_CLIENT_ID_HEADER is set) for provider scheduling, and record its
+    latency per route template.
+    """
+    request_id = request.headers.get(REQUEST_ID_HEADER) or new_request_id()
+    token = set_request_id(request_id)
+    client_id = client_address(
+        request.client.host if request.client else None,
+        request.headers.get(FORWARDED_FOR_HEADER),
+        TRUSTED_PROXIES,
+    )
+    if TRUST_CLIENT_ID_HEADER:
+        client_id = request.headers.get(CLIENT_ID_HEADER) or client_id
+    client_token = set_client_id(client_id)
+    HTTP_REQUESTS_IN_FLIGHT.inc()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers[REQUEST_ID_HEADER] = request_id
+        return response
+    finally:
+        elapsed = time.perf_counter() - start
+        HTTP_REQUESTS_IN_FLIGHT.dec()
+        # Use the route template, not the raw path, to keep label cardinality bounded
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        HTTP_REQUEST_DURATION.labels(
+            method=request.method, route=route, status=str(status)
+        ).observe(elapsed)
+        reset_client_id(client_token)
+        reset_request_id(token)
+
+
+# Shared by all upload routes; bounds bytes held by in-flight uploads
+upload_budget = MemoryBudget(UPLOAD_MEMORY_BUDGET_BYTES)
+
+
+@contextmanager
+def _receive_upload(file: UploadFile, allowed_kinds: frozenset[str], max_bytes: int):
+    """
+    Reserve memory budget, stream the upload to a temp file in fixed-size
+    blocks (hashing and type-checking it) and remove the file afterwards.
+    """
+    declared = getattr(file, "size", None)
+    if declared is not None and declared > max_bytes:
+        raise UploadTooLarge(max_bytes)
+    with upload_budget.reserve(declared or max_bytes, UPLOAD_BUDGET_WAIT_SECONDS):
+        with stage_timer("upload.save"):
+            upload = save_upload(file.file, allowed_kinds, max_bytes, UPLOAD_BLOCK_SIZE)
+        try:
+            yield upload
+        finally:
+            upload.remove()
+
+
+def _upload_http_error(e: Exception) -> HTTPException:
+    if isinstance(e, UploadTooLarge):
+        return HTTPException(status_code=413, detail=str(e))
+    if isinstance(e, UploadBackpressure):
+        return HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)}
+        )
+    if isinstance(e, UnsupportedUpload):
+        return HTTPException(status_code=415, detail=str(e))
+    return HTTPException(status_code=400, detail=str(e))
+
+
+def _overloaded_http_error(e: Overloaded) -> HTTPException:
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
+def _chunk(text: str, max_chars: int, route: str) -> list[str]:
+    with stage_timer("chunking"):
+        chunks = chunk_text(text, max_chars)
+    REQUEST_CHUNKS.labels(route=route).observe(len(chunks))
+    return chunks
+
 # -------------------------
 # Request / Response Models
 # -------------------------
@@ -58,6 +184,8 @@ class SpeechToTextResponse(BaseModel):
 
 class OCRResponse(BaseModel):
     text: str
+    # Per-line / per-word boxes and confidences; only for images with ?layout=true
+    layout: dict | None = None
 
 
 # -------- LLM MODELS --------
@@ -70,22 +198,52 @@ class TextRequest(BaseModel):
 # -------------------------
 # Routes
 # -------------------------
+# Routes are grouped per worker role; only routers for roles listed in
+# APP_ROLES are mounted. /health, /languages and /metrics are always served.
+
+translation_router = APIRouter()
+speech_router = APIRouter()
+ocr_router = APIRouter()
+llm_router = APIRouter()
+
+ROLE_ROUTERS = {
+    "translation": translation_router,
+    "speech": speech_router,
+    "ocr": ocr_router,
+    "llm": llm_router,
+}
+
+# Modules each role needs, imported eagerly when APP_PRELOAD is set
+ROLE_MODULES = {
+    "translation": ("app.services.sarvam_wrapper", "app.services.translation_service"),
+    "speech": ("app.services.sarvam_wrapper",),
+    # With an OCR worker pool the API process never needs the OCR stack itself
+    "ocr": ("app.services.ocr_dispatch",) + (() if OCR_WORKER_ADDRESS else ("app.services.ocr_service",)),
+    "llm": ("app.services.llm_service", "app.services.llm_analyzer"),
+}
 
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
 # -------- BASIC TRANSLATION --------
 
-@app.post("/translate", response_model=TranslateResponse)
+@translation_router.post("/translate", response_model=TranslateResponse)
 def translate_endpoint(request: TranslateRequest):
+    from app.services.sarvam_wrapper import translate_text
+
     try:
         text = (request.text or "").strip()
         if not text:
             return {"translated_text": ""}
 
-        chunks = chunk_text(text, TRANSLATE_MAX_CHARS)
+        chunks = _chunk(text, TRANSLATE_MAX_CHARS, "/translate")
         if not chunks:
             return {"translated_text": ""}
 
@@ -101,20 +259,24 @@ def translate_endpoint(request: TranslateRequest):
         translated = " ".join(parts)
         return {"translated_text": translated}
 
+    except Overloaded as e:
+        raise _overloaded_http_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # -------- MULTILINGUAL PIPELINE --------
 
-@app.post("/translate-pipeline", response_model=TranslateResponse)
+@translation_router.post("/translate-pipeline", response_model=TranslateResponse)
 def translate_pipeline_endpoint(request: TranslatePipelineRequest):
+    from app.services.translation_service import translate_pipeline
+
     try:
         text = (request.text or "").strip()
         if not text:
             return {"translated_text": ""}
 
-        chunks = chunk_text(text, TRANSLATE_MAX_CHARS)
+        chunks = _chunk(text, TRANSLATE_MAX_CHARS, "/translate-pipeline")
         if not chunks:
             return {"translated_text": ""}
 
@@ -130,6 +292,8 @@ def translate_pipeline_endpoint(request: TranslatePipelineRequest):
         translated = " ".join(parts)
         return {"translated_text": translated}
 
+    except Overloaded as e:
+        raise _overloaded_http_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -148,73 +312,76 @@ def list_supported_languages():
 
 # -------- SPEECH TO TEXT --------
 
-@app.post("/speech-to-text", response_model=SpeechToTextResponse)
+@speech_router.post("/speech-to-text", response_model=SpeechToTextResponse)
 def speech_to_text_endpoint(
     file: UploadFile = File(...),
     language_code: str = "hi-IN"
 ):
-    try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
-            temp_audio.write(file.file.read())
-            temp_audio_path = temp_audio.name
+    from app.services.sarvam_wrapper import speech_to_text
 
-        transcript = speech_to_text(
-            audio_path=temp_audio_path,
-            language_code=language_code
-        )
+    try:
+        with _receive_upload(file, AUDIO_KINDS, UPLOAD_MAX_BYTES_SPEECH) as upload:
+            transcript = speech_to_text(
+                audio_path=upload.path,
+                language_code=language_code
+            )
 
         return {"transcript": transcript}
 
+    except (UploadError, UploadBackpressure) as e:
+        raise _upload_http_error(e)
+    except Overloaded as e:
+        raise _overloaded_http_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-    finally:
-        if 'temp_audio_path' in locals() and os.path.exists(temp_audio_path):
-            os.remove(temp_audio_path)
-
 
 # -------- OCR (images + PDFs) --------
 
-@app.post("/image-to-text", response_model=OCRResponse)
-def image_to_text(file: UploadFile = File(...)):
+@ocr_router.post("/image-to-text", response_model=OCRResponse)
+def image_to_text(file: UploadFile = File(...), layout: bool = False):
     """
     Extract text from an uploaded image (jpg, png, webp, tiff) or PDF.
+    With layout=true, image uploads also return line / word bounding boxes
+    and confidences.
     """
+    from app.services.ocr_dispatch import run_ocr
+
     suffix = os.path.splitext(file.filename or "")[1] or ".jpg"
     if suffix.lower() not in {".pdf", ".jpg", ".jpeg", ".png", ".webp", ".tiff", ".tif", ".bmp"}:
         raise HTTPException(
             status_code=400,
             detail="Unsupported file type. Use PDF or image (jpg, png, webp, tiff)."
         )
+    # The declared suffix picks the family; the content must agree with it
+    allowed_kinds = frozenset({"pdf"}) if suffix.lower() == ".pdf" else IMAGE_KINDS
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
-            temp_file.write(file.file.read())
-            temp_path = temp_file.name
-
-        extracted_text = extract_text_from_document(temp_path, file.filename or "file")
+        with _receive_upload(file, allowed_kinds, UPLOAD_MAX_BYTES_OCR) as upload:
+            op = "layout" if layout and upload.kind in IMAGE_KINDS else "document"
+            result = run_ocr(op, upload.path, file.filename or "file", sha256=upload.sha256)
 
-        return {"text": extracted_text}
+        return result
 
+    except (UploadError, UploadBackpressure) as e:
+        raise _upload_http_error(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-    finally:
-        if 'temp_path' in locals() and os.path.exists(temp_path):
-            os.remove(temp_path)
-
 
 # -------- SUMMARIZE --------
 
-@app.post("/summarize")
+@llm_router.post("/summarize")
 def summarize_endpoint(request: TextRequest):
+    from app.services.llm_service import summarize_text
+
     try:
         text = (request.text or "").strip()
         if not text:
             return {"summary": ""}
 
-        chunks = chunk_text(text, LLM_MAX_CHARS)
+        chunks = _chunk(text, LLM_MAX_CHARS, "/summarize")
         if not chunks:
             return {"summary": ""}
 
@@ -226,20 +393,24 @@ def summarize_endpoint(request: TextRequest):
         summary = "\n\n".join(parts)
         return {"summary": summary}
 
+    except Overloaded as e:
+        raise _overloaded_http_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # -------- EXPLAIN FOR AUDIENCE --------
 
-@app.post("/explain")
+@llm_router.post("/explain")
 def explain_endpoint(request: TextRequest):
+    from app.services.llm_service import explain_for_audience
+
     try:
         text = (request.text or "").strip()
         if not text:
             return {"explanation": ""}
 
-        chunks = chunk_text(text, LLM_MAX_CHARS)
+        chunks = _chunk(text, LLM_MAX_CHARS, "/explain")
         if not chunks:
             return {"explanation": ""}
 
@@ -251,13 +422,16 @@ def explain_endpoint(request: TextRequest):
         explanation = "\n\n".join(parts)
         return {"explanation": explanation}
 
+    except Overloaded as e:
+        raise _overloaded_http_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # -------- AI DOCUMENT ANALYSIS --------
 
-@app.post("/ai-analyze")
+@llm_router.post("/ai-analyze")
 def ai_analyze(request: TextRequest):
+    from app.services.llm_analyzer import analyze_document_ai
 
     try:
 
@@ -268,6 +442,23 @@ def ai_analyze(request: TextRequest):
 
         return result
 
+    except Overloaded as e:
+        raise _overloaded_http_error(e)
     except Exception as e:
 
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# -------------------------
+# Role Registration
+# -------------------------
+
+for role in APP_ROLES:
+    app.include_router(ROLE_ROUTERS[role])
+
+if APP_PRELOAD:
+    import importlib
+
+    for role in APP_ROLES:
+        for module_name in ROLE_MODULES[role]:
+            importlib.import_module(module_name)
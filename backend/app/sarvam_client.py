@@ -1,6 +1,30 @@
-from sarvamai import SarvamAI
-from app.config import SARVAM_API_KEY
+from functools import lru_cache
 
-client = SarvamAI(
-    api_subscription_key=SARVAM_API_KEY
-)
+from app.config import SARVAM_API_KEY, SARVAM_BASE_URL
+
+
+def sarvam_environment(base_url: str):
+    """SDK environment pointing every Sarvam endpoint family at `base_url`."""
+    from sarvamai import SarvamAIEnvironment
+
+    base_url = base_url.rstrip("/")
+    websocket_url = "ws" + base_url[len("http"):] if base_url.startswith("http") else base_url
+    return SarvamAIEnvironment(base=base_url, creative=f"{base_url}/dubbing", production=websocket_url)
+
+
+@lru_cache(maxsize=1)
+def get_client():
+    """Build the Sarvam SDK client on first use (importing the SDK is slow)."""
+    from sarvamai import SarvamAI
+
+    return SarvamAI(
+        api_subscription_key=SARVAM_API_KEY,
+        **({"environment": sarvam_environment(SARVAM_BASE_URL)} if SARVAM_BASE_URL else {})
+    )
+
+
+def __getattr__(name):
+    # Backwards compatible `from app.sarvam_client import client`
+    if name == "client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,77 @@
+"""
+Multi-process launcher.
+
+Starts the pre-forked OCR worker pool, then uvicorn with several API worker
+processes that send OCR jobs to the pool and share one result cache file:
+
+    python -m app.serve --workers 4 --ocr-processes 8 --port 8000
+
+Explicit RESULT_CACHE_PATH / OCR_WORKER_ADDRESS / OCR_WORKER_AUTHKEY
+settings are respected; otherwise the first two default to files in a
+private (0700) directory created for this run and the authkey to a random
+secret. A fixed name in the shared temp directory could be created first
+by another local user.
+"""
+
+import argparse
+import os
+import secrets
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+
+_CPUS = os.cpu_count() or 1
+
+
+def _wait_for_socket(path: str, process: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if process.poll() is not None:
+            raise RuntimeError(f"OCR worker pool exited with code {process.returncode}")
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"OCR worker pool did not start listening on {path} within {timeout}s")
+        time.sleep(0.1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run API workers with a shared OCR pool and result cache.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=_CPUS, help="uvicorn API worker processes")
+    parser.add_argument("--ocr-processes", type=int, default=_CPUS, help="OCR pool processes")
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    # mkdtemp creates the directory with mode 0700; removed again on exit
+    run_dir = tempfile.mkdtemp(prefix="app-serve-")
+    env = os.environ
+    env.setdefault("RESULT_CACHE_ENABLED", "true")
+    env.setdefault("RESULT_CACHE_PATH", os.path.join(run_dir, "result-cache.sqlite"))
+    env.setdefault("OCR_WORKER_ADDRESS", os.path.join(run_dir, "ocr-worker.sock"))
+    env.setdefault("OCR_WORKER_AUTHKEY", secrets.token_hex(32))
+    env["OCR_WORKER_PROCESSES"] = str(args.ocr_processes)
+
+    address = env["OCR_WORKER_ADDRESS"]
+    # A socket left by a previous run would look like a ready pool
+    if os.path.exists(address) and stat.S_ISSOCK(os.stat(address).st_mode):
+        os.unlink(address)
+    ocr_pool = subprocess.Popen([sys.executable, "-m", "app.workers.ocr_worker"], env=env)
+    try:
+        _wait_for_socket(address, ocr_pool, args.startup_timeout)
+        import uvicorn
+
+        uvicorn.run("app.main:app", host=args.host, port=args.port, workers=args.workers)
+    finally:
+        ocr_pool.terminate()
+        try:
+            ocr_pool.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            ocr_pool.kill()
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
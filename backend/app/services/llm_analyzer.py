@@ -2,7 +2,11 @@
 import os
 import json
 import re
-from groq import Groq
+from functools import partial
+
+from app.services.provider_call import call_provider
+from app.services.result_cache import cached
+from app.utils.singleflight import coalesce
 
 
 # ---------------------------------------------------------------------------
@@ -16,6 +20,8 @@ def get_client():
     if not api_key:
         raise ValueError("GROQ_API_KEY not found in .env")
 
+    from groq import Groq  # imported on first use to keep worker startup fast
+
     return Groq(api_key=api_key)
 
 
@@ -48,6 +54,9 @@ def extract_json_from_text(text: str) -> dict:
 # MAIN AI ANALYZER
 # ---------------------------------------------------------------------------
 
+# A reply that could not be parsed is returned as {"error": ...}; not cached, so a retry asks again
+@cached("groq.analyze_document_ai", cache_if=lambda result: "error" not in result)
+@coalesce("groq.analyze_document_ai")
 def analyze_document_ai(text: str, audience: str = "general") -> dict:
     """
     Uses Groq LLM to analyze medical/legal documents.
@@ -129,7 +138,8 @@ Analyze this document carefully:
     # CALL LLM
     # ----------------------------
 
-    response = client.chat.completions.create(
+    response = call_provider("groq", partial(
+        client.chat.completions.create,
 
         model="llama-3.1-8b-instant",
 
@@ -146,7 +156,7 @@ Analyze this document carefully:
 
         temperature=0.0,   # 🔴 Force deterministic output
         max_tokens=700
-    )
+    ), cost=len(text))
 
     raw_output = response.choices[0].message.content.strip()
 
@@ -1,18 +1,27 @@
 import os
-from groq import Groq
+from functools import partial
+
+from app.services.provider_call import call_provider
+from app.services.result_cache import cached
+from app.utils.singleflight import coalesce
 
 
 def get_client():
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key:
         raise ValueError("GROQ_API_KEY not found in .env")
+    from groq import Groq  # imported on first use to keep worker startup fast
+
     return Groq(api_key=api_key)
 
 
+@cached("groq.summarize_text")
+@coalesce("groq.summarize_text")
 def summarize_text(text: str) -> str:
     client = get_client()
 
-    response = client.chat.completions.create(
+    response = call_provider("groq", partial(
+        client.chat.completions.create,
         model="llama-3.1-8b-instant",   # fast + free + good
         messages=[
             {"role": "system", "content": "Summarize this document in 4 very simple lines."},
@@ -20,11 +29,13 @@ def summarize_text(text: str) -> str:
         ],
         temperature=0.3,
         max_tokens=300
-    )
+    ), cost=len(text))
 
     return response.choices[0].message.content.strip()
 
 
+@cached("groq.explain_for_audience")
+@coalesce("groq.explain_for_audience")
 def explain_for_audience(text: str, audience: str) -> str:
     client = get_client()
 
@@ -36,13 +47,14 @@ Document:
 {text}
 """
 
-    response = client.chat.completions.create(
+    response = call_provider("groq", partial(
+        client.chat.completions.create,
         model="llama-3.1-8b-instant",   # SAME MODEL HERE
         messages=[
             {"role": "user", "content": prompt}
         ],
         temperature=0.4,
         max_tokens=400
-    )
+    ), cost=len(text))
 
     return response.choices[0].message.content.strip()
@@ -0,0 +1,54 @@
+"""
+OCR Dispatch Module
+
+Entry point for OCR from the API. Jobs go to the pre-forked OCR worker
+pool when OCR_WORKER_ADDRESS is set and run in-process otherwise; with the
+result cache enabled, results are reused by upload content hash.
+"""
+
+import os
+
+from app.config import OCR_WORKER_ADDRESS, OCR_WORKER_AUTHKEY, OCR_WORKER_TIMEOUT_SECONDS
+from app.services.result_cache import results
+from app.utils.metrics import POOL_IN_FLIGHT, stage_timer
+from app.workers.ocr_worker import OCRWorkerClient, run_job
+
+_client = (
+    OCRWorkerClient(OCR_WORKER_ADDRESS, OCR_WORKER_AUTHKEY, OCR_WORKER_TIMEOUT_SECONDS)
+    if OCR_WORKER_ADDRESS
+    else None
+)
+_remote_in_flight = POOL_IN_FLIGHT.labels(pool="ocr_worker")
+
+
+def run_ocr(op: str, path: str, filename: str = "file", sha256: str | None = None) -> dict:
+    """
+    Run an OCR job ("document" or "layout", see app.workers.ocr_worker).
+
+    Args:
+        sha256: Content hash of the file; enables result caching.
+
+    Returns:
+        dict: {"text": ...} plus "layout" for layout jobs.
+    """
+    key = None
+    if sha256 and results is not None:
+        extension = os.path.splitext(filename)[1].lower()
+        key = f"ocr:{op}:{extension}:{sha256}"
+        hit = results.get(key)
+        if hit is not None:
+            return hit
+
+    if _client is not None:
+        _remote_in_flight.inc()
+        try:
+            with stage_timer("ocr.remote"):
+                result = _client.call(op, path, filename)
+        finally:
+            _remote_in_flight.dec()
+    else:
+        result = run_job(op, path, filename)
+
+    if key is not None:
+        results.set(key, result)
+    return result
@@ -0,0 +1,199 @@
+"""
+Structured OCR results.
+
+Wraps Tesseract's image_to_data output in word / line objects carrying
+bounding boxes and confidences, and provides a refinement pass that
+re-OCRs only the lines Tesseract was unsure about (upscaled, single-line
+mode, optionally with one alternative language pack) instead of
+re-running the page.
+"""
+
+from dataclasses import dataclass, field
+
+import cv2
+import pytesseract
+
+from app.utils.metrics import stage_timer
+
+# Lines whose mean word confidence (0-100) falls below this are re-OCR'd
+REFINE_MIN_CONFIDENCE = 60.0
+# Cap on refined lines per image, so a bad scan can't multiply OCR cost
+REFINE_MAX_LINES = 8
+# Extra upscale applied to a low-confidence line before re-OCR
+REFINE_UPSCALE = 2.0
+REFINE_PADDING = 4
+# Tesseract page segmentation mode 7: treat the crop as a single text line
+REFINE_CONFIG = r'--oem 3 --psm 7'
+
+
+@dataclass
+class OCRWord:
+    text: str
+    confidence: float
+    left: int
+    top: int
+    width: int
+    height: int
+
+    def to_dict(self, scale: float = 1.0) -> dict:
+        return {
+            "text": self.text,
+            "confidence": round(self.confidence, 2),
+            "bbox": [
+                round(self.left / scale),
+                round(self.top / scale),
+                round(self.width / scale),
+                round(self.height / scale),
+            ],
+        }
+
+
+@dataclass
+class OCRLine:
+    words: list[OCRWord]
+    refined: bool = False
+
+    @property
+    def text(self) -> str:
+        return " ".join(word.text for word in self.words)
+
+    @property
+    def confidence(self) -> float:
+        if not self.words:
+            return 0.0
+        return sum(word.confidence for word in self.words) / len(self.words)
+
+    @property
+    def bbox(self) -> tuple[int, int, int, int]:
+        """(left, top, width, height) covering every word in the line."""
+        left = min(word.left for word in self.words)
+        top = min(word.top for word in self.words)
+        right = max(word.left + word.width for word in self.words)
+        bottom = max(word.top + word.height for word in self.words)
+        return left, top, right - left, bottom - top
+
+    def to_dict(self, scale: float = 1.0) -> dict:
+        left, top, width, height = self.bbox
+        return {
+            "text": self.text,
+            "confidence": round(self.confidence, 2),
+            "bbox": [round(left / scale), round(top / scale), round(width / scale), round(height / scale)],
+            "refined": self.refined,
+            "words": [word.to_dict(scale) for word in self.words],
+        }
+
+
+@dataclass
+class OCRResult:
+    lang: str
+    lines: list[OCRLine] = field(default_factory=list)
+    # Factor between the OCR'd image and the original (preprocessing upscales)
+    scale: float = 1.0
+
+    @property
+    def text(self) -> str:
+        return "\n".join(line.text for line in self.lines if line.words)
+
+    @property
+    def confidence(self) -> float:
+        words = [word for line in self.lines for word in line.words]
+        if not words:
+            return 0.0
+        return sum(word.confidence for word in words) / len(words)
+
+    def to_dict(self) -> dict:
+        """Serialise with boxes in original-image pixel coordinates."""
+        return {
+            "lang": self.lang,
+            "confidence": round(self.confidence, 2),
+            "lines": [line.to_dict(self.scale) for line in self.lines if line.words],
+        }
+
+
+def parse_image_data(data: dict, offset: tuple[int, int] = (0, 0), scale: float = 1.0) -> list[OCRLine]:
+    """
+    Group image_to_data word rows (level 5) into lines.
+
+    Boxes are divided by `scale` and shifted by `offset`, which maps results
+    from an upscaled crop back onto the image it was cut from.
+    """
+    lines: dict[tuple[int, int, int], OCRLine] = {}
+    dx, dy = offset
+    for i, text in enumerate(data.get("text", [])):
+        text = (text or "").strip()
+        confidence = float(data["conf"][i])
+        if int(data["level"][i]) != 5 or not text or confidence < 0:
+            continue
+        key = (int(data["block_num"][i]), int(data["par_num"][i]), int(data["line_num"][i]))
+        line = lines.setdefault(key, OCRLine(words=[]))
+        line.words.append(OCRWord(
+            text=text,
+            confidence=confidence,
+            left=dx + round(int(data["left"][i]) / scale),
+            top=dy + round(int(data["top"][i]) / scale),
+            width=round(int(data["width"][i]) / scale),
+            height=round(int(data["height"][i]) / scale),
+        ))
+    return [lines[key] for key in sorted(lines)]
+
+
+def ocr_image_data(img, lang: str, config: str, scale: float = 1.0) -> OCRResult:
+    """Run Tesseract on a preprocessed image and return structured results."""
+    data = pytesseract.image_to_data(img, lang=lang, config=config, output_type=pytesseract.Output.DICT)
+    return OCRResult(lang=lang, lines=parse_image_data(data), scale=scale)
+
+
+def refine_low_confidence(
+    img,
+    result: OCRResult,
+    alternative_lang: str | None = None,
+    min_confidence: float = REFINE_MIN_CONFIDENCE,
+    max_lines: int = REFINE_MAX_LINES,
+) -> int:
+    """
+    Re-OCR low-confidence lines of `result` in place.
+
+    Each weak line is cropped (with padding) from `img`, upscaled and read
+    in single-line mode with result.lang and alternative_lang, so at most
+    2 * max_lines Tesseract calls are made. The best-scoring reading
+    replaces the line only if it beats the original.
+
+    Returns:
+        Number of lines replaced.
+    """
+    candidates = [result.lang]
+    if alternative_lang and alternative_lang != result.lang:
+        candidates.append(alternative_lang)
+    weak = sorted(
+        (line for line in result.lines if line.words and line.confidence < min_confidence),
+        key=lambda line: line.confidence,
+    )[:max_lines]
+
+    height, width = img.shape[:2]
+    replaced = 0
+    for line in weak:
+        left, top, box_width, box_height = line.bbox
+        x0, y0 = max(0, left - REFINE_PADDING), max(0, top - REFINE_PADDING)
+        x1 = min(width, left + box_width + REFINE_PADDING)
+        y1 = min(height, top + box_height + REFINE_PADDING)
+        if x1 <= x0 or y1 <= y0:
+            continue
+        crop = cv2.resize(
+            img[y0:y1, x0:x1], None, fx=REFINE_UPSCALE, fy=REFINE_UPSCALE, interpolation=cv2.INTER_CUBIC
+        )
+
+        best: OCRLine | None = None
+        for lang in candidates:
+            with stage_timer("ocr.refine"):
+                data = pytesseract.image_to_data(
+                    crop, lang=lang, config=REFINE_CONFIG, output_type=pytesseract.Output.DICT
+                )
+            words = [word for found in parse_image_data(data, (x0, y0), REFINE_UPSCALE) for word in found.words]
+            if words and (best is None or OCRLine(words).confidence > best.confidence):
+                best = OCRLine(words=words, refined=True)
+
+        if best is not None and best.confidence > line.confidence:
+            line.words = best.words
+            line.refined = True
+            replaced += 1
+    return replaced
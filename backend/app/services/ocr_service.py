@@ -3,12 +3,18 @@ import re
 import platform
 import os
 
+import numpy as np
+
 try:
     import fitz  # PyMuPDF
 except ModuleNotFoundError:
     fitz = None  # type: ignore[assignment]
 
-from app.services.preprocessing import preprocess_image
+from app.config import OCR_JOB_THREADS, OCR_REFINE_ENABLED, PDF_OCR_MAX_PAGES
+from app.services.ocr_layout import OCRResult, ocr_image_data, refine_low_confidence
+from app.services.preprocessing import RESIZE_FACTOR, preprocess_image, preprocess_images
+from app.utils.metrics import stage_timer
+from app.utils.script_detection import guess_tesseract_lang
 
 
 # -------- SET TESSERACT PATH FOR WINDOWS --------
@@ -17,9 +23,30 @@ if platform.system() == "Windows":
 
 
 # -------- SCRIPT DETECTION --------
-def detect_script(img):
+# Language packs this service relies on; other scripts fall back to English
+OCR_LANGS = {"hin", "tam", "tel", "kan", "eng"}
+# Characters of known text sampled for local script detection
+HINT_SAMPLE_CHARS = 2000
+
+
+def detect_script(img, hint_text: str | None = None):
+    """
+    Pick the Tesseract language for a preprocessed image.
+
+    Known text from the same document (hint_text, e.g. a PDF's text layer)
+    is classified locally by Unicode block; otherwise Tesseract OSD decides.
+    """
+    if hint_text:
+        lang = guess_tesseract_lang(hint_text[:HINT_SAMPLE_CHARS])
+        if lang in OCR_LANGS:
+            return lang
+    return _detect_script_osd(img)
+
+
+def _detect_script_osd(img):
     try:
-        osd = pytesseract.image_to_osd(img)
+        with stage_timer("ocr.osd"):
+            osd = pytesseract.image_to_osd(img)
 
         if "Devanagari" in osd:
             return "hin"
@@ -40,43 +67,97 @@ def detect_script(img):
 
 
 # -------- MAIN OCR FUNCTION --------
-def extract_text_from_image(image_path: str) -> str:
-    # preprocess image first
-    img = preprocess_image(image_path)
+def _clean_text(text: str) -> str:
+    text = re.sub(r'\n+', '\n', text)
+    text = re.sub(r'[ \t]+', ' ', text)
+    return text.strip()
+
+
+def _alternative_lang(lang: str) -> str | None:
+    # Mixed-script lines (e.g. English test names in a Hindi report) read
+    # better with the English pack combined in
+    return None if lang == "eng" else f"{lang}+eng"
+
 
+def _ocr_structured(img, refine: bool = OCR_REFINE_ENABLED, lang: str | None = None) -> OCRResult:
     custom_config = r'--oem 3 --psm 6'
 
     # -------- SCRIPT DETECTION --------
-    lang = detect_script(img)
+    lang = lang or detect_script(img)
 
     # -------- OCR USING DETECTED SCRIPT --------
-    text = pytesseract.image_to_string(
-        img,
-        lang=lang,
-        config=custom_config
-    )
+    with stage_timer("ocr.tesseract"):
+        result = ocr_image_data(img, lang, custom_config, scale=RESIZE_FACTOR)
 
     # -------- FALLBACK TO ENGLISH --------
-    if not text.strip():
-        text = pytesseract.image_to_string(
-            img,
-            lang="eng",
-            config=custom_config
-        )
+    if not result.text.strip() and lang != "eng":
+        with stage_timer("ocr.tesseract"):
+            result = ocr_image_data(img, "eng", custom_config, scale=RESIZE_FACTOR)
+
+    # -------- RE-OCR ONLY THE WEAK LINES --------
+    if refine:
+        refine_low_confidence(img, result, _alternative_lang(result.lang))
+
+    return result
 
+
+def _ocr_preprocessed(img, lang: str | None = None) -> str:
     # -------- FINAL CLEANUP --------
-    text = re.sub(r'\n+', '\n', text)
-    text = re.sub(r'[ \t]+', ' ', text)
-    text = text.strip()
+    return _clean_text(_ocr_structured(img, lang=lang).text)
+
+
+def extract_text_from_image(image_path: str) -> str:
+    return _clean_text(extract_structured_from_image(image_path).text)
+
+
+def extract_structured_from_image(image_path: str, refine: bool = OCR_REFINE_ENABLED) -> OCRResult:
+    """
+    OCR an image keeping per-line / per-word boxes and confidences.
+    With refine (OCR_REFINE_ENABLED by default), low-confidence lines are
+    re-read (see ocr_layout.refine_low_confidence).
+    """
+    # preprocess image first
+    with stage_timer("preprocess"):
+        img = preprocess_image(image_path)
+
+    return _ocr_structured(img, refine)
 
-    return text
+
+def extract_text_from_images(images: list, lang: str | None = None) -> list[str]:
+    """
+    OCR several images (paths, encoded bytes or decoded arrays) at once.
+    Preprocessing reuses pooled buffers and pages are processed in parallel
+    threads (OpenCV and the Tesseract subprocess both release the GIL).
+    Pass lang when the images share a known script to skip per-image detection.
+    At most OCR_JOB_THREADS images are processed at once (0 = CPU count).
+    """
+    with stage_timer("ocr.batch"):
+        return preprocess_images(
+            images, lambda index, img: _ocr_preprocessed(img, lang), max_workers=OCR_JOB_THREADS or None
+        )
 
 
 # -------- PDF TEXT EXTRACTION --------
-def extract_text_from_pdf(pdf_path: str) -> str:
+# Scanned pages (no text layer) are rasterized at this resolution and OCR'd;
+# preprocessing upscales 1.8x on top, so ~270 dpi reaches Tesseract.
+PDF_RASTER_DPI = 150
+# Scanned pages rasterized and held in memory at once
+PDF_OCR_BATCH_PAGES = max(2, (OCR_JOB_THREADS or os.cpu_count() or 1) * 2)
+
+
+def _rasterize_gray(page) -> np.ndarray:
+    pix = page.get_pixmap(dpi=PDF_RASTER_DPI, colorspace=fitz.csGRAY, alpha=False)
+    rows = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)
+    return rows[:, :pix.width]
+
+
+def extract_text_from_pdf(pdf_path: str, max_ocr_pages: int = PDF_OCR_MAX_PAGES) -> str:
     """
     Extract text from a PDF file using PyMuPDF (fitz).
-    Handles multi-page PDFs by concatenating page text.
+    Handles multi-page PDFs by concatenating page text. Up to max_ocr_pages
+    pages without a text layer (PDF_OCR_MAX_PAGES by default, 0 = none) are
+    rasterized straight to grayscale and OCR'd in parallel batches; further
+    scanned pages stay empty.
     Requires: pip install pymupdf
     """
     if fitz is None:
@@ -87,18 +168,35 @@ def extract_text_from_pdf(pdf_path: str) -> str:
         raise FileNotFoundError(f"PDF file not found: {pdf_path}")
 
     text_parts = []
+    scanned = []
     doc = fitz.open(pdf_path)
     try:
         for page in doc:
-            text_parts.append(page.get_text())
+            with stage_timer("pdf.page_extract"):
+                text_parts.append(page.get_text())
+            if len(scanned) < max_ocr_pages and not text_parts[-1].strip():
+                scanned.append(page.number)
+
+        # One script per document: take it from the text layer when there is
+        # one, else from script detection on the first scanned page
+        lang = None
+        if scanned:
+            known_text = "".join(text_parts)
+            lang = guess_tesseract_lang(known_text[:HINT_SAMPLE_CHARS]) if known_text.strip() else None
+            if lang not in OCR_LANGS:
+                first = _rasterize_gray(doc[scanned[0]])
+                lang = preprocess_images([first], lambda index, img: detect_script(img))[0]
+
+        for start in range(0, len(scanned), PDF_OCR_BATCH_PAGES):
+            batch = scanned[start:start + PDF_OCR_BATCH_PAGES]
+            with stage_timer("pdf.rasterize"):
+                pages = [_rasterize_gray(doc[number]) for number in batch]
+            for number, page_text in zip(batch, extract_text_from_images(pages, lang)):
+                text_parts[number] = page_text
     finally:
         doc.close()
 
-    text = "\n".join(text_parts)
-    text = re.sub(r'\n+', '\n', text)
-    text = re.sub(r'[ \t]+', ' ', text)
-    text = text.strip()
-    return text
+    return _clean_text("\n".join(text_parts))
 
 
 # -------- UNIFIED DOCUMENT EXTRACTION --------
@@ -1,18 +1,171 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, TypeVar
+
 import cv2
+import numpy as np
+
+T = TypeVar("T")
+
+# Resize slightly to help OCR
+RESIZE_FACTOR = 1.8
+# Very light blur to remove tiny noise (safe)
+BLUR_KERNEL = (3, 3)
+# Idle bytes kept by the process-wide buffer pool
+POOL_MAX_BYTES = 64 * 1024 * 1024
+
+
+class BufferPool:
+    """
+    Reusable uint8 image buffers keyed by shape.
+
+    Preprocessing the pages of one document produces the same output shape
+    over and over; leasing buffers from here avoids reallocating them.
+    Uploads come in arbitrary sizes, so the idle buffers are capped at
+    `max_bytes` in total: past that, the least recently used shapes are
+    dropped first.
+    """
+
+    def __init__(self, max_bytes: int = POOL_MAX_BYTES, max_per_shape: int = 8):
+        self.max_bytes = max_bytes
+        self.max_per_shape = max_per_shape
+        self._free: OrderedDict[tuple[int, ...], list[np.ndarray]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def idle_bytes(self) -> int:
+        with self._lock:
+            return self._bytes
+
+    def acquire(self, shape: tuple[int, ...]) -> np.ndarray:
+        with self._lock:
+            free = self._free.get(shape)
+            if free:
+                buffer = free.pop()
+                self._bytes -= buffer.nbytes
+                if not free:
+                    del self._free[shape]
+                return buffer
+        return np.empty(shape, dtype=np.uint8)
+
+    def release(self, buffer: np.ndarray) -> None:
+        if buffer.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            free = self._free.setdefault(buffer.shape, [])
+            self._free.move_to_end(buffer.shape)
+            if len(free) >= self.max_per_shape:
+                return
+            free.append(buffer)
+            self._bytes += buffer.nbytes
+            while self._bytes > self.max_bytes:
+                shape, oldest = next(iter(self._free.items()))
+                self._bytes -= oldest.pop(0).nbytes
+                if not oldest:
+                    del self._free[shape]
+
+
+_default_pool = BufferPool()
 
-def preprocess_image(image_path: str):
-    img = cv2.imread(image_path)
 
-    if img is None:
+def _load_gray(source, pool: BufferPool | None = None) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Load `source` as a single-channel image.
+
+    Accepts a file path, encoded image bytes, or a decoded array (grayscale,
+    BGR or BGRA, e.g. a rasterized PDF page). Files and bytes are decoded
+    straight to grayscale, skipping the 3-channel intermediate.
+
+    Returns (gray, leased) where leased is a pool buffer the caller must
+    release, or None.
+    """
+    if isinstance(source, str):
+        img = cv2.imread(source, cv2.IMREAD_GRAYSCALE)
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        img = cv2.imdecode(np.frombuffer(source, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    else:
+        img = np.asarray(source)
+        if img.ndim == 3 and img.shape[2] == 1:
+            img = img[:, :, 0]
+        if img.ndim == 3:
+            code = cv2.COLOR_BGRA2GRAY if img.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+            if pool is not None:
+                gray = pool.acquire(img.shape[:2])
+                cv2.cvtColor(img, code, dst=gray)
+                return gray, gray
+            img = cv2.cvtColor(img, code)
+
+    if img is None or img.size == 0:
         raise ValueError("Image not loaded in preprocessing")
+    return img, None
+
+
+def _scaled_shape(shape: tuple[int, ...]) -> tuple[int, int]:
+    height, width = shape[:2]
+    return int(round(height * RESIZE_FACTOR)), int(round(width * RESIZE_FACTOR))
+
+
+def _preprocess_into(gray: np.ndarray, out: np.ndarray) -> np.ndarray:
+    height, width = out.shape
+    cv2.resize(gray, (width, height), dst=out, interpolation=cv2.INTER_CUBIC)
+    cv2.GaussianBlur(out, BLUR_KERNEL, 0, dst=out)
+    return out
+
+
+def preprocess_image(image_path: str):
+    # Grayscale first so the (costly) cubic resize and the blur touch one channel
+    gray, _ = _load_gray(image_path)
+    out = np.empty(_scaled_shape(gray.shape), dtype=np.uint8)
+    return _preprocess_into(gray, out)
+
+
+def preprocess_images(
+    sources: Iterable,
+    consume: Callable[[int, np.ndarray], T],
+    max_workers: int | None = None,
+    pool: BufferPool | None = None,
+) -> list[T]:
+    """
+    Preprocess many images in parallel and hand each result to `consume`.
+
+    Output arrays come from a BufferPool and are recycled as soon as
+    consume() returns, so consume must not keep a reference to the array
+    (pytesseract copies it, which is fine). OpenCV releases the GIL, so
+    worker threads run the resize and blur concurrently.
 
-    # Resize slightly to help OCR
-    img = cv2.resize(img, None, fx=1.8, fy=1.8, interpolation=cv2.INTER_CUBIC)
+    Args:
+        sources: Paths, encoded bytes or decoded arrays (see _load_gray).
+        consume: Called as consume(index, preprocessed_gray) in a worker thread.
+        max_workers: Thread count; defaults to the CPU count.
+        pool: Buffer pool to lease from; defaults to a process-wide pool.
 
-    # Convert to grayscale
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    Returns:
+        consume() results in input order.
+    """
+    pool = pool or _default_pool
+    sources = list(sources)
+    if not sources:
+        return []
 
-    # Very light blur to remove tiny noise (safe)
-    gray = cv2.GaussianBlur(gray, (3, 3), 0)
+    def work(index: int) -> T:
+        gray, leased = _load_gray(sources[index], pool)
+        out = pool.acquire(_scaled_shape(gray.shape))
+        try:
+            _preprocess_into(gray, out)
+            if leased is not None:
+                pool.release(leased)
+                leased = None
+            return consume(index, out)
+        finally:
+            pool.release(out)
+            if leased is not None:
+                pool.release(leased)
 
-    return gray
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(sources)))
+    if workers == 1:
+        return [work(index) for index in range(len(sources))]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="preprocess") as executor:
+        return list(executor.map(work, range(len(sources))))
@@ -0,0 +1,263 @@
+"""
+Provider Call Module
+
+Single choke point for outbound Sarvam / Groq requests.
+
+Every call is timed into a per-provider rolling latency histogram. When
+hedging is enabled (HEDGING_ENABLED), a call that has not returned by the
+provider's recent HEDGE_PERCENTILE latency is duplicated and whichever
+attempt finishes first wins; the loser is cancelled if it has not started
+and otherwise left to finish in the background with its result discarded.
+A token budget caps hedges to a fraction of primary calls so a provider
+slowdown cannot turn into double load.
+
+With SCHEDULER_ENABLED, each call first takes a slot from a weighted fair
+scheduler keyed by the requesting client, which enforces per-client
+concurrency and character budgets and sheds calls with Overloaded.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterator, TypeVar
+
+from app.config import (
+    CLIENT_CHAR_BURST,
+    CLIENT_CHAR_RATE,
+    CLIENT_MAX_CONCURRENCY,
+    CLIENT_MAX_QUEUED,
+    CLIENT_WEIGHTS,
+    HEDGE_BUDGET_BURST,
+    HEDGE_BUDGET_RATIO,
+    HEDGE_MAX_WORKERS,
+    HEDGE_MIN_DELAY_SECONDS,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
+    HEDGE_WINDOW_SECONDS,
+    HEDGING_ENABLED,
+    SCHEDULER_ENABLED,
+    SCHEDULER_MAX_CONCURRENCY,
+    SCHEDULER_MAX_QUEUE,
+    SCHEDULER_MAX_WAIT_SECONDS,
+)
+from app.utils.fair_scheduler import FairScheduler, Overloaded
+from app.utils.histogram import RollingHistogram
+from app.utils.metrics import (
+    POOL_CAPACITY,
+    POOL_IN_FLIGHT,
+    PROVIDER_HEDGES,
+    PROVIDER_REQUEST_DURATION,
+    PROVIDER_REQUESTS,
+    SCHEDULER_QUEUE_WAIT,
+    SCHEDULER_QUEUED,
+    SCHEDULER_SHED,
+)
+from app.utils.tracing import get_client_id, get_request_id
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class HedgeBudget:
+    """
+    Token bucket limiting hedged attempts.
+
+    Each primary call earns `ratio` tokens (capped at `burst`); each hedge
+    spends one. Over time, hedges stay below ratio * primaries + burst.
+    """
+
+    def __init__(self, ratio: float, burst: float):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = burst
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+_latency: dict[str, RollingHistogram] = {}
+_latency_lock = threading.Lock()
+_budget = HedgeBudget(HEDGE_BUDGET_RATIO, HEDGE_BUDGET_BURST)
+_executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_WORKERS, thread_name_prefix="provider")
+_pool_in_flight = POOL_IN_FLIGHT.labels(pool="provider")
+POOL_CAPACITY.labels(pool="provider").set(HEDGE_MAX_WORKERS)
+
+_scheduler = FairScheduler(
+    capacity=SCHEDULER_MAX_CONCURRENCY,
+    per_client_limit=CLIENT_MAX_CONCURRENCY,
+    max_wait=SCHEDULER_MAX_WAIT_SECONDS,
+    max_queue=SCHEDULER_MAX_QUEUE,
+    per_client_queue=CLIENT_MAX_QUEUED,
+    char_rate=CLIENT_CHAR_RATE,
+    char_burst=CLIENT_CHAR_BURST,
+    weights=CLIENT_WEIGHTS,
+)
+POOL_IN_FLIGHT.set_function(_scheduler.in_flight, pool="scheduler")
+POOL_CAPACITY.labels(pool="scheduler").set(SCHEDULER_MAX_CONCURRENCY)
+SCHEDULER_QUEUED.set_function(_scheduler.queued)
+
+
+def get_latency_histogram(provider: str) -> RollingHistogram:
+    """Return (creating on first use) the rolling latency histogram for a provider."""
+    with _latency_lock:
+        histogram = _latency.get(provider)
+        if histogram is None:
+            histogram = RollingHistogram(window_seconds=HEDGE_WINDOW_SECONDS)
+            _latency[provider] = histogram
+        return histogram
+
+
+def hedge_delay(provider: str) -> float | None:
+    """
+    Seconds to wait before hedging a call to `provider`, or None while the
+    histogram has too few samples to trust.
+    """
+    histogram = get_latency_histogram(provider)
+    if histogram.count < HEDGE_MIN_SAMPLES:
+        return None
+    delay = histogram.percentile(HEDGE_PERCENTILE)
+    if delay is None:
+        return None
+    return max(delay, HEDGE_MIN_DELAY_SECONDS)
+
+
+def _status_code(error: BaseException) -> int | None:
+    """Best-effort HTTP status of an SDK exception (Sarvam and Groq differ)."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _timed(provider: str, fn: Callable[[], T]) -> T:
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        return fn()
+    except Exception as e:
+        outcome = "rate_limited" if _status_code(e) == 429 else "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        if outcome == "ok":
+            get_latency_histogram(provider).observe(elapsed)
+        PROVIDER_REQUEST_DURATION.labels(provider=provider).observe(elapsed)
+        PROVIDER_REQUESTS.labels(provider=provider, outcome=outcome).inc()
+        logger.debug(
+            "provider=%s outcome=%s duration=%.3fs request_id=%s",
+            provider, outcome, elapsed, get_request_id()
+        )
+
+
+def _run_pooled(provider: str, fn: Callable[[], T]) -> T:
+    try:
+        return _timed(provider, fn)
+    finally:
+        _pool_in_flight.dec()
+
+
+def _release_if_cancelled(future: Future) -> None:
+    # Cancelled work never reaches _run_pooled, so release its slot here
+    if future.cancelled():
+        _pool_in_flight.dec()
+
+
+def _submit(provider: str, fn: Callable[[], T]) -> Future:
+    # Run under a copy of the caller's context so the request id survives
+    ctx = contextvars.copy_context()
+    _pool_in_flight.inc()
+    future = _executor.submit(ctx.run, _run_pooled, provider, fn)
+    future.add_done_callback(_release_if_cancelled)
+    return future
+
+
+def _first_success(futures: list[Future]) -> T:
+    """Return the first successful result; raise the first error if all fail."""
+    pending = set(futures)
+    first_error: BaseException | None = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            error = future.exception()
+            if error is None:
+                for other in pending:
+                    other.cancel()
+                return future.result()
+            if first_error is None:
+                first_error = error
+    raise first_error
+
+
+@contextmanager
+def _scheduled(cost: float) -> Iterator[None]:
+    client = get_client_id() or "anonymous"
+    try:
+        waited = _scheduler.acquire(client, cost)
+    except Overloaded as e:
+        SCHEDULER_SHED.labels(reason=e.reason).inc()
+        logger.info(
+            "shed provider call client=%s reason=%s request_id=%s", client, e.reason, get_request_id()
+        )
+        raise
+    SCHEDULER_QUEUE_WAIT.observe(waited)
+    try:
+        yield
+    finally:
+        _scheduler.release(client)
+
+
+def call_provider(provider: str, fn: Callable[[], T], hedge: bool = True, cost: float = 1.0) -> T:
+    """
+    Invoke a zero-argument provider call, hedging it if enabled.
+
+    Args:
+        provider: Provider name used to key latency stats (e.g. "sarvam").
+        fn: Callable performing exactly one upstream request. Must be safe to
+            run twice concurrently when hedge=True.
+        hedge: Set False for non-idempotent calls or calls holding a
+            stream/file handle.
+        cost: Size of the call (input characters) for fair scheduling and
+            per-client budgets.
+
+    Returns:
+        The result of whichever attempt succeeded first.
+
+    Raises:
+        Overloaded: The scheduler shed the call (SCHEDULER_ENABLED only).
+    """
+    if not SCHEDULER_ENABLED:
+        return _call(provider, fn, hedge)
+    with _scheduled(cost):
+        return _call(provider, fn, hedge)
+
+
+def _call(provider: str, fn: Callable[[], T], hedge: bool) -> T:
+    if not (HEDGING_ENABLED and hedge):
+        return _timed(provider, fn)
+
+    _budget.record_request()
+    delay = hedge_delay(provider)
+    if delay is None:
+        return _timed(provider, fn)
+
+    primary = _submit(provider, fn)
+    done, _ = wait([primary], timeout=delay)
+    if done or not _budget.try_spend():
+        return primary.result()
+
+    PROVIDER_HEDGES.labels(provider=provider).inc()
+    backup = _submit(provider, fn)
+    return _first_success([primary, backup])
@@ -0,0 +1,39 @@
+"""
+Result Cache Module
+
+Builds the stores behind the result cache and the translation memory.
+With RESULT_CACHE_PATH set, both are tables in one SQLite (WAL) file that
+every worker process on the box opens, so a result computed by one
+process is served by all of them; otherwise each process keeps an LRU.
+"""
+
+from typing import Any, Callable
+
+from app.config import (
+    RESULT_CACHE_ENABLED,
+    RESULT_CACHE_MAX_ENTRIES,
+    RESULT_CACHE_PATH,
+    RESULT_CACHE_TTL_SECONDS,
+)
+from app.utils.lru import LRUCache
+from app.utils.shared_cache import SQLiteCache, memoize
+
+
+def build_store(table: str, max_entries: int, ttl: float | None = None):
+    """Shared SQLite table when RESULT_CACHE_PATH is set, else an in-process LRU."""
+    if RESULT_CACHE_PATH:
+        return SQLiteCache(RESULT_CACHE_PATH, table=table, ttl=ttl, max_entries=max_entries)
+    return LRUCache(max_entries, ttl=ttl)
+
+
+results = build_store("results", RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_TTL_SECONDS) if RESULT_CACHE_ENABLED else None
+
+
+def cached(namespace: str, cache_if: Callable[[Any], bool] | None = None) -> Callable:
+    """
+    Memoize a function in the result cache; a no-op when the cache is disabled.
+    Results for which cache_if returns False (e.g. error payloads) are not stored.
+    """
+    if results is None:
+        return lambda fn: fn
+    return memoize(results, namespace, cache_if)
@@ -10,7 +10,15 @@ All SDK-specific logic is contained here.
 """
 
 import os
-from app.sarvam_client import client
+from functools import partial
+
+from app.config import LOCAL_LANGUAGE_DETECTION
+from app.sarvam_client import get_client
+from app.services.provider_call import call_provider
+from app.services.result_cache import cached
+from app.utils.fair_scheduler import Overloaded
+from app.utils.script_detection import guess_language_code
+from app.utils.singleflight import coalesce
 
 # Sarvam API limit: input must be at most 2000 characters
 MAX_TRANSLATE_INPUT_LENGTH = 2000
@@ -40,16 +48,25 @@ def speech_to_text(
         raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
     try:
+        client = get_client()
         with open(audio_path, "rb") as audio_file:
-            response = client.speech_to_text.transcribe(
-                file=audio_file,
-                model=model,
-                language_code=language_code
+            # Not hedged: both attempts would share one file handle
+            response = call_provider(
+                "sarvam",
+                partial(
+                    client.speech_to_text.transcribe,
+                    file=audio_file,
+                    model=model,
+                    language_code=language_code
+                ),
+                hedge=False
             )
 
         # SDK returns a structured object; extract plain text
         return response.transcript
 
+    except Overloaded:
+        raise
     except Exception as e:
         raise RuntimeError(f"Speech-to-text failed: {str(e)}") from e
 
@@ -75,6 +92,18 @@ def _chunk_text(text: str, max_length: int) -> list[str]:
     return chunks
 
 
+def resolve_source_language(text: str, source_language_code: str = "auto") -> str:
+    """
+    Replace "auto" with a locally detected language code when the text's
+    script identifies it (see utils.script_detection); otherwise keep it.
+    """
+    if source_language_code != "auto" or not LOCAL_LANGUAGE_DETECTION:
+        return source_language_code
+    return guess_language_code(text) or "auto"
+
+
+@cached("sarvam.translate_text")
+@coalesce("sarvam.translate_text")
 def translate_text(
     text: str,
     source_language_code: str = "auto",
@@ -83,6 +112,8 @@ def translate_text(
     """
     Translates input text into a target language.
     Long text is chunked to respect Sarvam's 2000-character input limit.
+    With source "auto", each chunk's language is detected locally where
+    possible; chunks already in the target language are returned as-is.
 
     Args:
         text (str): Input text to translate.
@@ -105,13 +136,25 @@ def translate_text(
 
     translated_parts = []
     try:
+        client = get_client()
         for chunk in chunks:
-            response = client.text.translate(
-                input=chunk,
-                source_language_code=source_language_code,
-                target_language_code=target_language_code
+            chunk_source = resolve_source_language(chunk, source_language_code)
+            if chunk_source == target_language_code:
+                translated_parts.append(chunk)
+                continue
+            response = call_provider(
+                "sarvam",
+                partial(
+                    client.text.translate,
+                    input=chunk,
+                    source_language_code=chunk_source,
+                    target_language_code=target_language_code
+                ),
+                cost=len(chunk)
             )
             translated_parts.append(response.translated_text)
         return " ".join(translated_parts)
+    except Overloaded:
+        raise
     except Exception as e:
         raise RuntimeError(f"Translation failed: {str(e)}") from e
@@ -0,0 +1,218 @@
+"""
+Translation Memory Module
+
+Sentence-level reuse of earlier translations. Text is split into
+segments; a segment seen before (same source / target language) is served
+from memory, and a segment that differs from a stored one only in its
+numbers reuses the stored translation with the new numbers substituted.
+Only the remaining segments are sent to Sarvam, batched per run of
+consecutive misses.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Callable
+
+from app.utils.lru import LRUCache
+
+# Sentence ends (Latin and Indic danda) followed by whitespace, or line breaks
+_BOUNDARY = re.compile(r'((?<=[.!?।॥])[ \t]+|\n+)')
+# A period after these doesn't end a sentence: short capitalised tokens (Mr.,
+# Dr., Rs., No., Ref.), dotted initials (e.g., i.e., A.K.) and common
+# abbreviations; a lone capital ("Form A.") still ends a sentence
+_ABBREVIATION = re.compile(
+    r'(?:^|[\s(])(?:[A-Z][A-Za-z]{1,2}|[A-Za-z](?:\.[A-Za-z])+|(?i:etc|vs|viz|approx|govt|dept|prof|shri|smt|nos))\.$'
+)
+# Digit runs with optional thousands / decimal separators; \d covers Indic digits
+_NUMBER = re.compile(r'\d+(?:[.,]\d+)*')
+_PLACEHOLDER = "⟦{}⟧"   # ⟦0⟧, ⟦1⟧, ...
+_PLACEHOLDER_PATTERN = re.compile("⟦(\\d+)⟧")
+
+# Joins a run of new segments into one Sarvam request; split back afterwards
+BATCH_SEPARATOR = "\n"
+
+
+def segment(text: str) -> list[tuple[str, str]]:
+    """Split text into (segment, following separator) pairs; joining them restores text."""
+    parts = _BOUNDARY.split(text)
+    pairs = []
+    pending = ""
+    for i in range(0, len(parts), 2):
+        separator = parts[i + 1] if i + 1 < len(parts) else ""
+        piece = pending + parts[i]
+        pending = ""
+        if piece and separator and "\n" not in separator and _ABBREVIATION.search(piece):
+            # "Mr. Sharma": keep the abbreviation with the words that follow it
+            pending = piece + separator
+        elif piece:
+            pairs.append((piece, separator))
+        elif pairs:
+            pairs[-1] = (pairs[-1][0], pairs[-1][1] + separator)
+    return pairs
+
+
+def _normalize(segment_text: str) -> str:
+    return " ".join(segment_text.split())
+
+
+def _number_value(number: str) -> str:
+    """Script-independent value of a number: ASCII digits, separators dropped."""
+    return "".join(str(unicodedata.digit(char)) for char in number if char.isdigit())
+
+
+def _digit_zero(number: str) -> str:
+    """The zero of the digit script a number is written in ('0', '०', ...)."""
+    for char in number:
+        if char.isdigit():
+            return chr(ord(char) - unicodedata.digit(char))
+    return "0"
+
+
+def _render_number(number: str, zero: str) -> str:
+    return "".join(
+        chr(ord(zero) + unicodedata.digit(char)) if char.isdigit() else char
+        for char in number
+    )
+
+
+def template(segment_text: str) -> tuple[str, list[str]]:
+    """Replace each number with a numbered placeholder; return (template, numbers)."""
+    numbers: list[str] = []
+
+    def replace(match: re.Match) -> str:
+        numbers.append(match.group(0))
+        return _PLACEHOLDER.format(len(numbers) - 1)
+
+    return _NUMBER.sub(replace, _normalize(segment_text)), numbers
+
+
+@dataclass
+class TemplateEntry:
+    # Translation with ⟦i⟧ where source number i appeared
+    text: str
+    # Digit script zero used for each placeholder in the translation
+    zeros: list[str]
+
+
+def _templatize_translation(numbers: list[str], translation: str) -> TemplateEntry | None:
+    """
+    Map the numbers found in a translation back to the source numbers by
+    value. Returns None when that mapping is ambiguous (repeated values,
+    numbers added / dropped / reformatted by the translator).
+    """
+    values = [_number_value(number) for number in numbers]
+    if len(set(values)) != len(values):
+        return None
+    found = list(_NUMBER.finditer(translation))
+    if sorted(_number_value(match.group(0)) for match in found) != sorted(values):
+        return None
+
+    zeros = [""] * len(numbers)
+    pieces, last = [], 0
+    for match in found:
+        index = values.index(_number_value(match.group(0)))
+        zeros[index] = _digit_zero(match.group(0))
+        pieces.append(translation[last:match.start()])
+        pieces.append(_PLACEHOLDER.format(index))
+        last = match.end()
+    pieces.append(translation[last:])
+    return TemplateEntry(text="".join(pieces), zeros=zeros)
+
+
+class TranslationMemory:
+    """
+    Segment store with exact and number-insensitive lookup.
+
+    `store` is any object with get(key) / set(key, value); the default is an
+    in-process LRU.
+    """
+
+    def __init__(self, store=None, max_segments: int = 50_000):
+        self.store = store if store is not None else LRUCache(max_segments)
+
+    @staticmethod
+    def _exact_key(source: str, target: str, segment_text: str) -> str:
+        return f"tm:exact:{source}:{target}:{_normalize(segment_text)}"
+
+    @staticmethod
+    def _template_key(source: str, target: str, template_text: str) -> str:
+        return f"tm:template:{source}:{target}:{template_text}"
+
+    def lookup(self, segment_text: str, source: str, target: str) -> str | None:
+        exact = self.store.get(self._exact_key(source, target, segment_text))
+        if exact is not None:
+            return exact
+
+        template_text, numbers = template(segment_text)
+        if not numbers:
+            return None
+        entry = self.store.get(self._template_key(source, target, template_text))
+        if entry is None:
+            return None
+        entry = entry if isinstance(entry, TemplateEntry) else TemplateEntry(**entry)
+        return _PLACEHOLDER_PATTERN.sub(
+            lambda match: _render_number(numbers[int(match.group(1))], entry.zeros[int(match.group(1))]),
+            entry.text,
+        )
+
+    def store_translation(self, segment_text: str, source: str, target: str, translation: str) -> None:
+        self.store.set(self._exact_key(source, target, segment_text), translation)
+        template_text, numbers = template(segment_text)
+        if numbers:
+            entry = _templatize_translation(numbers, translation)
+            if entry is not None:
+                self.store.set(
+                    self._template_key(source, target, template_text),
+                    {"text": entry.text, "zeros": entry.zeros},
+                )
+
+    def translate(
+        self,
+        text: str,
+        source: str,
+        target: str,
+        translate_fn: Callable[[str, str], str],
+        resolve_source: Callable[[str, str], str] | None = None,
+    ) -> str:
+        """
+        Translate `text`, serving known segments from memory.
+
+        Args:
+            translate_fn: Called as translate_fn(text, source) for new segments.
+            resolve_source: Optional per-segment source language resolver
+                (e.g. local detection for "auto").
+        """
+        pairs = segment(text)
+        sources = [resolve_source(seg, source) if resolve_source else source for seg, _ in pairs]
+        results: list[str | None] = [
+            self.lookup(seg, seg_source, target) for (seg, _), seg_source in zip(pairs, sources)
+        ]
+
+        # Batch each run of consecutive misses that share a source language
+        i = 0
+        while i < len(pairs):
+            if results[i] is not None:
+                i += 1
+                continue
+            j = i
+            while j < len(pairs) and results[j] is None and sources[j] == sources[i]:
+                j += 1
+            run = [pairs[k][0] for k in range(i, j)]
+            translated = translate_fn(BATCH_SEPARATOR.join(run), sources[i])
+            split = translated.split(BATCH_SEPARATOR)
+            if len(split) == len(run):
+                for k, piece in zip(range(i, j), split):
+                    results[k] = piece.strip()
+                    self.store_translation(pairs[k][0], sources[k], target, results[k])
+            else:
+                # Translator merged or split lines: keep the run's translation
+                # whole (in its last slot) and store nothing for it
+                for k in range(i, j - 1):
+                    results[k] = ""
+                results[j - 1] = translated.strip()
+            i = j
+
+        return "".join(
+            result + separator for (_, separator), result in zip(pairs, results) if result
+        ).strip()
@@ -1,6 +1,16 @@
 import re
-from app.services.sarvam_wrapper import translate_text
-from app.config import SUPPORTED_LANGUAGES
+from app.services.sarvam_wrapper import resolve_source_language, translate_text
+from app.services.result_cache import build_store
+from app.services.translation_memory import TranslationMemory
+from app.config import (
+    SUPPORTED_LANGUAGES,
+    TRANSLATION_MEMORY_ENABLED,
+    TRANSLATION_MEMORY_MAX_SEGMENTS,
+)
+
+translation_memory = TranslationMemory(
+    store=build_store("translation_memory", TRANSLATION_MEMORY_MAX_SEGMENTS)
+)
 
 
 def clean_text(text: str) -> str:
@@ -19,6 +29,9 @@ def translate_pipeline(
 ) -> str:
     """
     Translates text into the requested target language.
+    With TRANSLATION_MEMORY_ENABLED, previously translated sentences (and
+    sentences differing only in numbers) are reused and only new ones are
+    sent to Sarvam.
 
     Args:
         text (str): Input text to translate.
@@ -45,6 +58,19 @@ def translate_pipeline(
 
     target_language_code = SUPPORTED_LANGUAGES[target_lang]["sarvam_code"]
 
+    if TRANSLATION_MEMORY_ENABLED:
+        return translation_memory.translate(
+            text,
+            source_language_code,
+            target_language_code,
+            lambda segments, source: translate_text(
+                text=segments,
+                source_language_code=source,
+                target_language_code=target_language_code
+            ),
+            resolve_source=resolve_source_language
+        )
+
     return translate_text(
         text=text,
         source_language_code=source_language_code,
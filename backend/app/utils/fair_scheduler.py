@@ -0,0 +1,247 @@
+"""
+Weighted fair scheduling of shared capacity across clients.
+
+Callers acquire a slot before each unit of work (a provider request) and
+release it afterwards. Waiting calls are granted slots in weighted fair
+queuing order: each call gets a virtual finish tag start + cost / weight,
+where start is the later of the scheduler's virtual clock and the client's
+previous finish tag, and the waiting call with the smallest tag goes next.
+A client with a large backlog therefore queues behind its own work while
+other clients' calls are interleaved at their fair share.
+
+Per client, at most `per_client_limit` calls run at once, at most
+`per_client_queue` wait, and, optionally, a token bucket limits cost units
+(characters) per second. Waiting blocks the caller's thread, so the
+per-client queue cap is what stops one client from tying up a shared
+thread pool. Calls over budget, arriving at a full (global or per-client)
+queue, or still waiting after `max_wait` seconds are shed with Overloaded.
+"""
+
+import itertools
+import math
+import threading
+import time
+from dataclasses import dataclass
+
+# Client states are swept for idle entries every this many acquisitions
+SWEEP_EVERY = 1024
+
+
+class Overloaded(RuntimeError):
+    """
+    Raised when a call is shed.
+
+    reason is "quota", "client_queue_full", "queue_full" or "deadline";
+    retry_after is a suggested delay in whole seconds.
+    """
+
+    def __init__(self, message: str, retry_after: int, reason: str):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+def _retry_seconds(seconds: float) -> int:
+    return max(1, math.ceil(seconds))
+
+
+class TokenBucket:
+    """Refills at `rate` tokens per second up to `burst`. Not thread-safe by itself."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def take(self, amount: float, now: float) -> float:
+        """Take `amount` tokens; return 0, or the seconds until enough are available."""
+        self._refill(now)
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def give(self, amount: float) -> None:
+        self.tokens = min(self.burst, self.tokens + amount)
+
+    def full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.burst
+
+
+@dataclass
+class _ClientState:
+    weight: float
+    bucket: TokenBucket | None
+    active: int = 0
+    waiting: int = 0
+    last_finish: float = 0.0
+
+
+@dataclass(eq=False)
+class _Waiter:
+    client: str
+    start: float
+    finish: float
+    seq: int
+    granted: bool = False
+
+
+class FairScheduler:
+    def __init__(
+        self,
+        capacity: int,
+        per_client_limit: int,
+        max_wait: float,
+        max_queue: int = 256,
+        per_client_queue: int = 4,
+        char_rate: float = 0.0,
+        char_burst: float = 0.0,
+        weights: dict[str, float] | None = None,
+    ):
+        self.capacity = capacity
+        self.per_client_limit = per_client_limit
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.per_client_queue = per_client_queue
+        self.char_rate = char_rate
+        self.char_burst = char_burst
+        self.weights = weights or {}
+        self._cond = threading.Condition()
+        self._clients: dict[str, _ClientState] = {}
+        self._waiting: list[_Waiter] = []
+        self._active = 0
+        self._vtime = 0.0
+        self._max_finish = 0.0
+        self._seq = itertools.count()
+
+    def in_flight(self) -> int:
+        with self._cond:
+            return self._active
+
+    def queued(self) -> int:
+        with self._cond:
+            return len(self._waiting)
+
+    def _state(self, client: str) -> _ClientState:
+        state = self._clients.get(client)
+        if state is None:
+            bucket = TokenBucket(self.char_rate, self.char_burst) if self.char_rate > 0 else None
+            state = _ClientState(weight=self.weights.get(client, 1.0), bucket=bucket)
+            self._clients[client] = state
+        return state
+
+    def acquire(self, client: str, cost: float = 1.0) -> float:
+        """
+        Block until `client` is granted a slot for a call of `cost` units.
+
+        Returns:
+            Seconds spent waiting.
+
+        Raises:
+            Overloaded: Over budget, queue full, or not granted within max_wait.
+        """
+        cost = max(cost, 1.0)
+        arrived = time.monotonic()
+        with self._cond:
+            seq = next(self._seq)
+            if seq % SWEEP_EVERY == 0:
+                self._sweep(arrived)
+            state = self._state(client)
+
+            charged = 0.0
+            if state.bucket is not None:
+                # A single call larger than the burst is allowed once the bucket is full
+                charged = min(cost, state.bucket.burst)
+                delay = state.bucket.take(charged, arrived)
+                if delay > 0:
+                    raise Overloaded(
+                        f"Client '{client}' exceeded its character budget",
+                        retry_after=_retry_seconds(delay), reason="quota",
+                    )
+            # A call that can run now never waits, so only queued calls count against the caps
+            can_start = (
+                self._active < self.capacity and not self._waiting
+                and state.active < self.per_client_limit
+            )
+            if not can_start:
+                reason = None
+                if state.waiting >= self.per_client_queue:
+                    reason, message = "client_queue_full", f"Client '{client}' has too many queued calls"
+                elif len(self._waiting) >= self.max_queue:
+                    reason, message = "queue_full", "Provider queue is full"
+                if reason is not None:
+                    if state.bucket is not None:
+                        state.bucket.give(charged)
+                    raise Overloaded(message, retry_after=_retry_seconds(self.max_wait), reason=reason)
+
+            start = max(self._vtime, state.last_finish)
+            waiter = _Waiter(client, start, start + cost / state.weight, seq)
+            state.last_finish = waiter.finish
+            self._max_finish = max(self._max_finish, waiter.finish)
+            state.waiting += 1
+            self._waiting.append(waiter)
+            self._dispatch()
+
+            deadline = arrived + self.max_wait
+            while not waiter.granted:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiting.remove(waiter)
+                    state.waiting -= 1
+                    if state.last_finish == waiter.finish:
+                        # Not served, so not charged against the fair share
+                        state.last_finish = waiter.start
+                    if state.bucket is not None:
+                        state.bucket.give(charged)
+                    raise Overloaded(
+                        "Timed out waiting for a provider slot",
+                        retry_after=_retry_seconds(self.max_wait), reason="deadline",
+                    )
+                self._cond.wait(remaining)
+            state.waiting -= 1
+            return time.monotonic() - arrived
+
+    def release(self, client: str) -> None:
+        with self._cond:
+            self._clients[client].active -= 1
+            self._active -= 1
+            if self._active == 0 and not self._waiting:
+                # Idle: past usage no longer counts against anyone
+                self._vtime = self._max_finish
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant free slots to eligible waiters in finish-tag order. Caller holds the lock."""
+        granted = False
+        while self._active < self.capacity and self._waiting:
+            eligible = [
+                waiter for waiter in self._waiting
+                if self._clients[waiter.client].active < self.per_client_limit
+            ]
+            if not eligible:
+                break
+            waiter = min(eligible, key=lambda w: (w.finish, w.seq))
+            self._waiting.remove(waiter)
+            waiter.granted = True
+            self._vtime = max(self._vtime, waiter.start)
+            self._clients[waiter.client].active += 1
+            self._active += 1
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    def _sweep(self, now: float) -> None:
+        """Forget clients with nothing in flight, a full bucket and no fair-share debt."""
+        for client in [
+            client for client, state in self._clients.items()
+            if not state.active and not state.waiting and state.last_finish <= self._vtime
+            and (state.bucket is None or state.bucket.full(now))
+        ]:
+            del self._clients[client]
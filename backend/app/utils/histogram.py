@@ -0,0 +1,123 @@
+"""
+Fixed-bucket histograms for latency tracking.
+Histogram is cumulative since creation; RollingHistogram only remembers the
+last one or two windows so percentiles follow recent behaviour.
+"""
+
+import bisect
+import threading
+import time
+
+# Upper bounds in seconds; an implicit +Inf bucket follows the last one.
+DEFAULT_LATENCY_BUCKETS = (
+    0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 30.0, 60.0
+)
+
+
+def estimate_percentile(buckets: tuple[float, ...], counts: list[int], q: float) -> float | None:
+    """
+    Estimate the q-th quantile (0..1) from per-bucket counts, interpolating
+    linearly inside the bucket that contains the target rank.
+
+    Returns None when there are no observations. Values in the +Inf bucket
+    are reported as the largest finite bound.
+    """
+    total = sum(counts)
+    if total == 0:
+        return None
+    q = min(max(q, 0.0), 1.0)
+    rank = q * total
+    cumulative = 0
+    for index, count in enumerate(counts):
+        if count and cumulative + count >= rank:
+            if index >= len(buckets):
+                return buckets[-1]
+            lower = buckets[index - 1] if index > 0 else 0.0
+            upper = buckets[index]
+            return lower + (upper - lower) * ((rank - cumulative) / count)
+        cumulative += count
+    return buckets[-1]
+
+
+class Histogram:
+    """Thread-safe cumulative histogram (Prometheus-style buckets, sum and count)."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @property
+    def count(self) -> int:
+        with self._lock:
+            return sum(self._counts)
+
+    def percentile(self, q: float) -> float | None:
+        with self._lock:
+            counts = list(self._counts)
+        return estimate_percentile(self.buckets, counts, q)
+
+    def snapshot(self) -> tuple[list[int], float]:
+        """Return (per-bucket counts including +Inf, sum of observations)."""
+        with self._lock:
+            return list(self._counts), self._sum
+
+
+class RollingHistogram:
+    """
+    Histogram over a sliding time window.
+
+    Observations land in the current window; when it is older than
+    window_seconds it becomes the previous window and a fresh one starts.
+    Queries merge both, so the estimate always covers between one and two
+    windows of recent data.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 300.0,
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        self.window_seconds = window_seconds
+        self._current = [0] * (len(self.buckets) + 1)
+        self._previous = [0] * (len(self.buckets) + 1)
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _rotate(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._started
+        if elapsed < self.window_seconds:
+            return
+        if elapsed >= 2 * self.window_seconds:
+            self._previous = [0] * len(self._current)
+        else:
+            self._previous = self._current
+        self._current = [0] * len(self._previous)
+        self._started = now
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._rotate()
+            self._current[index] += 1
+
+    @property
+    def count(self) -> int:
+        with self._lock:
+            self._rotate()
+            return sum(self._current) + sum(self._previous)
+
+    def percentile(self, q: float) -> float | None:
+        with self._lock:
+            self._rotate()
+            counts = [a + b for a, b in zip(self._current, self._previous)]
+        return estimate_percentile(self.buckets, counts, q)
@@ -0,0 +1,40 @@
+"""
+Thread-safe in-process LRU cache with a get / set interface.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class LRUCache:
+    def __init__(self, maxsize: int, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires, value = item
+            if expires is not None and expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,255 @@
+"""
+Minimal Prometheus-style metrics.
+Counters, gauges and histograms with labels, rendered in the Prometheus text
+exposition format by render_metrics() (served at GET /metrics).
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from app.utils.histogram import DEFAULT_LATENCY_BUCKETS, Histogram
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    @abstractmethod
+    def _new_child(self):
+        """Value holder for one label combination."""
+
+    def labels(self, **labels: str):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._new_child()
+                self._children[key] = child
+            return child
+
+    def _items(self) -> list[tuple[tuple[str, ...], object]]:
+        with self._lock:
+            return sorted(self._children.items())
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in self._items():
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: tuple[str, ...], child) -> list[str]:
+        labels = _format_labels(self.labelnames, values)
+        return [f"{self.name}{labels} {_format_value(child.get())}"]
+
+
+class _Value:
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+    def get(self) -> float:
+        with self._lock:
+            return self._value
+
+
+class _FunctionValue:
+    def __init__(self, fn: Callable[[], float]):
+        self._fn = fn
+
+    def get(self) -> float:
+        return self._fn()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def set_function(self, fn: Callable[[], float], **labels: str) -> None:
+        """Report fn() at scrape time instead of a stored value."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._children[key] = _FunctionValue(fn)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+
+class HistogramMetric(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return Histogram(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _render_child(self, values: tuple[str, ...], child: Histogram) -> list[str]:
+        counts, total = child.snapshot()
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = 'le="' + _format_value(bound) + '"'
+            labels = _format_labels(self.labelnames, values, le)
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+REGISTRY: list[_Metric] = []
+
+
+def render_metrics() -> str:
+    lines: list[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# -------------------------
+# Application metrics
+# -------------------------
+
+HTTP_REQUEST_DURATION = HistogramMetric(
+    "http_request_duration_seconds",
+    "HTTP request latency by route.",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled.",
+)
+STAGE_DURATION = HistogramMetric(
+    "stage_duration_seconds",
+    "Time spent in each processing stage.",
+    ("stage",),
+)
+REQUEST_CHUNKS = HistogramMetric(
+    "request_chunks",
+    "Number of provider-sized chunks per request.",
+    ("route",),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+PROVIDER_REQUESTS = Counter(
+    "provider_requests_total",
+    "Upstream provider calls by outcome (ok, error, rate_limited).",
+    ("provider", "outcome"),
+)
+PROVIDER_REQUEST_DURATION = HistogramMetric(
+    "provider_request_duration_seconds",
+    "Upstream provider call latency.",
+    ("provider",),
+)
+PROVIDER_HEDGES = Counter(
+    "provider_hedged_requests_total",
+    "Duplicate provider calls fired by hedging.",
+    ("provider",),
+)
+POOL_IN_FLIGHT = Gauge(
+    "pool_in_flight",
+    "Work items running or queued in internal pools.",
+    ("pool",),
+)
+POOL_CAPACITY = Gauge(
+    "pool_capacity",
+    "Worker capacity of internal pools.",
+    ("pool",),
+)
+SINGLEFLIGHT_COALESCED = Counter(
+    "singleflight_coalesced_total",
+    "Calls that joined an identical in-flight call instead of running their own.",
+)
+SCHEDULER_QUEUE_WAIT = HistogramMetric(
+    "scheduler_queue_wait_seconds",
+    "Time provider calls waited for a scheduler slot.",
+)
+SCHEDULER_QUEUED = Gauge(
+    "scheduler_queued",
+    "Provider calls waiting for a scheduler slot.",
+)
+SCHEDULER_SHED = Counter(
+    "scheduler_shed_total",
+    "Provider calls rejected by the scheduler (quota, queue_full, deadline).",
+    ("reason",),
+)
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """Record the duration of a processing stage, including failed attempts."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_DURATION.labels(stage=stage).observe(time.perf_counter() - start)
@@ -0,0 +1,165 @@
+"""
+Local script and language detection from Unicode block histograms.
+Cheap enough to run on every chunk, so translation can send an explicit
+source language (or skip text already in the target language) and OCR can
+pick Tesseract packs without an OSD pass.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+
+# (first code point, last code point, script name)
+SCRIPT_RANGES = (
+    (0x0900, 0x097F, "Devanagari"),
+    (0x0980, 0x09FF, "Bengali"),
+    (0x0A00, 0x0A7F, "Gurmukhi"),
+    (0x0A80, 0x0AFF, "Gujarati"),
+    (0x0B00, 0x0B7F, "Oriya"),
+    (0x0B80, 0x0BFF, "Tamil"),
+    (0x0C00, 0x0C7F, "Telugu"),
+    (0x0C80, 0x0CFF, "Kannada"),
+    (0x0D00, 0x0D7F, "Malayalam"),
+    (0x0041, 0x005A, "Latin"),
+    (0x0061, 0x007A, "Latin"),
+    (0x00C0, 0x024F, "Latin"),
+)
+
+# Script -> Sarvam language code where the script identifies one language.
+# Devanagari (Hindi / Marathi) and Latin (English, but also romanized Indic
+# text and other European languages) are resolved separately.
+SCRIPT_LANGUAGE_CODES = {
+    "Bengali": "bn-IN",
+    "Gurmukhi": "pa-IN",
+    "Gujarati": "gu-IN",
+    "Oriya": "od-IN",
+    "Tamil": "ta-IN",
+    "Telugu": "te-IN",
+    "Kannada": "kn-IN",
+    "Malayalam": "ml-IN",
+}
+
+# Script -> Tesseract language pack
+SCRIPT_TESSERACT_LANGS = {
+    "Latin": "eng",
+    "Devanagari": "hin",
+    "Bengali": "ben",
+    "Gurmukhi": "pan",
+    "Gujarati": "guj",
+    "Oriya": "ori",
+    "Tamil": "tam",
+    "Telugu": "tel",
+    "Kannada": "kan",
+    "Malayalam": "mal",
+}
+
+# Frequent function words that tell Marathi and Hindi apart
+MARATHI_MARKERS = frozenset({"आहे", "आहेत", "नाही", "आणि", "मध्ये", "च्या", "हे", "व"})
+HINDI_MARKERS = frozenset({"है", "हैं", "और", "में", "का", "की", "के", "नहीं", "यह", "से"})
+
+# Common English function words; Latin text is only called English when
+# enough of its words are among them
+ENGLISH_STOPWORDS = frozenset({
+    "a", "about", "after", "all", "an", "and", "any", "are", "as", "at", "be", "been",
+    "before", "but", "by", "can", "could", "do", "does", "for", "from", "had", "has",
+    "have", "he", "her", "his", "how", "i", "if", "in", "into", "is", "it", "its",
+    "may", "must", "my", "no", "not", "of", "on", "or", "our", "please", "shall",
+    "she", "should", "so", "than", "that", "the", "their", "them", "there", "these",
+    "they", "this", "those", "to", "was", "we", "were", "what", "when", "which",
+    "who", "will", "with", "would", "you", "your",
+})
+ENGLISH_MIN_WORDS = 3
+ENGLISH_MIN_STOPWORD_SHARE = 0.2
+_WORD = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+MIN_LETTERS = 12
+MIN_SHARE = 0.85
+
+
+@dataclass(frozen=True)
+class ScriptGuess:
+    script: str
+    share: float      # fraction of classified letters in this script
+    letters: int      # number of classified letters
+
+
+def _script_of(char: str) -> str | None:
+    code = ord(char)
+    for first, last, script in SCRIPT_RANGES:
+        if first <= code <= last:
+            return script
+    return None
+
+
+def script_histogram(text: str) -> Counter:
+    """Count letters per script; digits, punctuation and spaces are ignored."""
+    counts: Counter = Counter()
+    for char in text:
+        if char.isspace() or char.isdigit():
+            continue
+        script = _script_of(char)
+        if script is not None:
+            counts[script] += 1
+    return counts
+
+
+@lru_cache(maxsize=4096)
+def detect_script(text: str, min_letters: int = MIN_LETTERS, min_share: float = MIN_SHARE) -> ScriptGuess | None:
+    """
+    Dominant script of `text`, or None when there are too few letters or
+    no script reaches `min_share`. Results are cached per text.
+    """
+    counts = script_histogram(text)
+    total = sum(counts.values())
+    if total < min_letters:
+        return None
+    script, letters = counts.most_common(1)[0]
+    share = letters / total
+    if share < min_share:
+        return None
+    return ScriptGuess(script=script, share=share, letters=total)
+
+
+def _devanagari_language(text: str) -> str | None:
+    words = text.split()
+    marathi = sum(1 for word in words if word in MARATHI_MARKERS) + text.count("ळ")
+    hindi = sum(1 for word in words if word in HINDI_MARKERS)
+    if marathi >= 2 * max(hindi, 1):
+        return "mr-IN"
+    if hindi >= 2 * max(marathi, 1):
+        return "hi-IN"
+    return None
+
+
+def _latin_language(text: str) -> str | None:
+    words = _WORD.findall(text.lower())
+    if len(words) < ENGLISH_MIN_WORDS:
+        return None
+    stopwords = sum(1 for word in words if word in ENGLISH_STOPWORDS)
+    if stopwords / len(words) >= ENGLISH_MIN_STOPWORD_SHARE:
+        return "en-IN"
+    return None
+
+
+@lru_cache(maxsize=4096)
+def guess_language_code(text: str) -> str | None:
+    """
+    Sarvam language code for `text` when it can be told locally, else None
+    (callers should then fall back to "auto").
+    """
+    guess = detect_script(text)
+    if guess is None:
+        return None
+    if guess.script == "Devanagari":
+        return _devanagari_language(text)
+    if guess.script == "Latin":
+        return _latin_language(text)
+    return SCRIPT_LANGUAGE_CODES.get(guess.script)
+
+
+def guess_tesseract_lang(text: str) -> str | None:
+    """Tesseract language pack matching the dominant script of `text`, if any."""
+    guess = detect_script(text)
+    return SCRIPT_TESSERACT_LANGS.get(guess.script) if guess else None
+
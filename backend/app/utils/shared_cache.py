@@ -0,0 +1,133 @@
+"""
+Cross-process cache on SQLite in WAL mode.
+Every API worker on the box opens the same file, so a result computed by
+one process is visible to the others. Values are stored as JSON.
+"""
+
+import copy
+import functools
+import inspect
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable
+
+from app.utils.singleflight import make_key
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL,
+    updated_at REAL NOT NULL
+)
+"""
+_TABLE_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class SQLiteCache:
+    """
+    get / set cache backed by a SQLite file shared between processes.
+
+    Each thread keeps its own connection. WAL lets readers proceed while a
+    writer commits. The table is trimmed back to max_entries (oldest
+    updates first) every prune_every writes. Caches with different size
+    limits should use separate tables of the same file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: str = "cache",
+        ttl: float | None = None,
+        max_entries: int = 100_000,
+        prune_every: int = 1000,
+    ):
+        if not _TABLE_NAME.match(table):
+            raise ValueError(f"Invalid table name: {table!r}")
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA.format(table=self.table))
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, default: Any = None) -> Any:
+        row = self._connect().execute(
+            f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return default
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            return default
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else None
+        self._connect().execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, updated_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value, ensure_ascii=False), expires_at, now),
+        )
+        with self._writes_lock:
+            self._writes += 1
+            prune = self._writes % self.prune_every == 0
+        if prune:
+            self.prune()
+
+    def prune(self) -> None:
+        """Drop expired rows and trim to max_entries."""
+        conn = self._connect()
+        conn.execute(
+            f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),)
+        )
+        conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN ("
+            f"SELECT key FROM {self.table} ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def __len__(self) -> int:
+        return self._connect().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+def memoize(store, namespace: str, cache_if: Callable[[Any], bool] | None = None) -> Callable:
+    """
+    Decorator caching a function's results in `store` (anything with
+    get / set) under a hash of the namespace and bound arguments. Only
+    successful, non-None results for which cache_if (if given) is true are
+    stored; callers get their own copy.
+    """
+    def decorator(fn: Callable) -> Callable:
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = f"{namespace}:{make_key(namespace, **bound.arguments)}"
+            cached = store.get(key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+            result = fn(*args, **kwargs)
+            if result is not None and (cache_if is None or cache_if(result)):
+                store.set(key, copy.deepcopy(result))
+            return result
+        return wrapper
+    return decorator
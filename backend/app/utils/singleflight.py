@@ -0,0 +1,117 @@
+"""
+Single-flight request coalescing.
+Concurrent calls with the same key share one execution: the first caller
+(the leader) runs the function, later callers block until it finishes and
+receive the same result or exception. The exception is not shared when it
+is about the leader rather than the call: a leader shed by the fair
+scheduler (Overloaded, e.g. over its client's quota) leaves each follower
+to run the call itself, under its own client's limits.
+"""
+
+import copy
+import functools
+import hashlib
+import inspect
+import json
+import threading
+from typing import Any, Callable
+
+from app.utils.fair_scheduler import Overloaded
+from app.utils.metrics import POOL_IN_FLIGHT, SINGLEFLIGHT_COALESCED
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Deduplicates in-flight calls by key. Nothing is kept once a call completes."""
+
+    def __init__(self):
+        self._calls: dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def do(
+        self, key: str, fn: Callable[[], Any], unshared_errors: tuple[type[BaseException], ...] = ()
+    ) -> tuple[Any, bool]:
+        """
+        Run fn once per key among concurrent callers.
+
+        A follower whose leader raised one of unshared_errors runs fn
+        itself instead of re-raising.
+
+        Returns:
+            (result, shared) where shared is True for callers that reused
+            another caller's execution. Shared results are deep copies so
+            callers cannot mutate each other's data.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            SINGLEFLIGHT_COALESCED.inc()
+            call.done.wait()
+            if isinstance(call.error, unshared_errors):
+                return fn(), False
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result), True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+
+def make_key(namespace: str, *args, **kwargs) -> str:
+    """Stable hash of a function namespace and its (JSON-serialisable) inputs."""
+    payload = json.dumps([namespace, args, kwargs], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Shared by all @coalesce-decorated functions; keys are namespaced per function
+default_group = SingleFlight()
+POOL_IN_FLIGHT.set_function(default_group.in_flight, pool="singleflight")
+
+
+def coalesce(namespace: str, group: SingleFlight | None = None) -> Callable:
+    """
+    Decorator routing calls through a SingleFlight group keyed by a hash of
+    the bound arguments (defaults applied), so identical concurrent calls hit
+    the upstream provider only once however they were spelled.
+    """
+    group = group or default_group
+
+    def decorator(fn: Callable) -> Callable:
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = make_key(namespace, **bound.arguments)
+            result, _ = group.do(key, functools.partial(fn, *args, **kwargs), unshared_errors=(Overloaded,))
+            return result
+        return wrapper
+    return decorator
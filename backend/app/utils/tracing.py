@@ -0,0 +1,72 @@
+"""
+Lightweight request tracing context.
+The HTTP middleware stores the originating request id and client identity
+in context variables; code running on behalf of that request (including
+provider pool threads, which copy the caller's context) can read them back
+for logging and per-client scheduling.
+"""
+
+import contextvars
+import ipaddress
+import uuid
+
+REQUEST_ID_HEADER = "X-Request-ID"
+# Tenant identity for quotas, honoured only with TRUST_CLIENT_ID_HEADER (set by
+# the API gateway); otherwise the client IP is used
+CLIENT_ID_HEADER = "X-Client-ID"
+# Appended to by each reverse proxy; read only when the peer is a trusted proxy
+FORWARDED_FOR_HEADER = "X-Forwarded-For"
+
+_request_id: contextvars.ContextVar[str | None] = contextvars.ContextVar("request_id", default=None)
+_client_id: contextvars.ContextVar[str | None] = contextvars.ContextVar("client_id", default=None)
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex
+
+
+def set_request_id(request_id: str) -> contextvars.Token:
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token: contextvars.Token) -> None:
+    _request_id.reset(token)
+
+
+def get_request_id() -> str | None:
+    return _request_id.get()
+
+
+def set_client_id(client_id: str) -> contextvars.Token:
+    return _client_id.set(client_id)
+
+
+def reset_client_id(token: contextvars.Token) -> None:
+    _client_id.reset(token)
+
+
+def get_client_id() -> str | None:
+    return _client_id.get()
+
+
+def _is_trusted(address: str, trusted_proxies) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted_proxies)
+
+
+def client_address(peer: str | None, forwarded_for: str | None, trusted_proxies=()) -> str:
+    """
+    The caller's address behind zero or more trusted reverse proxies.
+
+    Starting from the connecting peer, walks X-Forwarded-For from the right
+    while the current hop is one of trusted_proxies (ip_network objects);
+    entries left of the first untrusted hop could be forged by the caller.
+    """
+    address = peer or "anonymous"
+    hops = [hop.strip() for hop in (forwarded_for or "").split(",") if hop.strip()]
+    while hops and _is_trusted(address, trusted_proxies):
+        address = hops.pop()
+    return address
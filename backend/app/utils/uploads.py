@@ -0,0 +1,195 @@
+"""
+Bounded-memory upload handling.
+Uploads are copied to a temp file in fixed-size blocks while being hashed,
+checked against a size cap and identified by their magic bytes, so memory
+use per upload stays at one block regardless of file size.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+IMAGE_KINDS = frozenset({"jpeg", "png", "webp", "tiff", "bmp"})
+DOCUMENT_KINDS = IMAGE_KINDS | {"pdf"}
+AUDIO_KINDS = frozenset({"wav", "mp3", "ogg", "flac", "webm", "m4a", "mp4"})
+
+KIND_EXTENSIONS = {
+    "pdf": ".pdf",
+    "jpeg": ".jpg",
+    "png": ".png",
+    "webp": ".webp",
+    "tiff": ".tiff",
+    "bmp": ".bmp",
+    "wav": ".wav",
+    "mp3": ".mp3",
+    "ogg": ".ogg",
+    "flac": ".flac",
+    "webm": ".webm",
+    "m4a": ".m4a",
+    "mp4": ".mp4",
+}
+
+
+class UploadError(ValueError):
+    """Base class for rejected uploads."""
+
+
+class UploadTooLarge(UploadError):
+    def __init__(self, limit: int):
+        super().__init__(f"Upload exceeds the {limit // (1024 * 1024)} MB limit")
+        self.limit = limit
+
+
+class UnsupportedUpload(UploadError):
+    pass
+
+
+class UploadBackpressure(RuntimeError):
+    """Raised when the process memory budget stays exhausted past the wait limit."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Server is busy processing uploads, retry shortly")
+        self.retry_after = retry_after
+
+
+def sniff_kind(head: bytes) -> str | None:
+    """Identify a file type from its first bytes; None if unrecognised."""
+    if head.startswith(b"%PDF-"):
+        return "pdf"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head.startswith((b"II*\x00", b"MM\x00*")):
+        return "tiff"
+    if head.startswith(b"BM"):
+        return "bmp"
+    if head.startswith(b"ID3") or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+        return "mp3"
+    if head.startswith(b"OggS"):
+        return "ogg"
+    if head.startswith(b"fLaC"):
+        return "flac"
+    # EBML header: WebM / Matroska (the browser recorder sends audio/webm;codecs=opus)
+    if head.startswith(b"\x1a\x45\xdf\xa3"):
+        return "webm"
+    # ISO base media: box size, then "ftyp" and the major brand
+    if head[4:8] == b"ftyp":
+        return "m4a" if head[8:12] in (b"M4A ", b"M4B ") else "mp4"
+    return None
+
+
+@dataclass
+class SavedUpload:
+    path: str
+    size: int
+    sha256: str
+    kind: str
+
+    @property
+    def extension(self) -> str:
+        return KIND_EXTENSIONS[self.kind]
+
+    def remove(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def save_upload(
+    source: BinaryIO,
+    allowed_kinds: frozenset[str],
+    max_bytes: int,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> SavedUpload:
+    """
+    Stream `source` into a temp file, hashing as it goes.
+
+    Args:
+        source: Readable binary file object (e.g. UploadFile.file).
+        allowed_kinds: File kinds (see sniff_kind) accepted for this route.
+        max_bytes: Reject uploads larger than this.
+        block_size: Bytes read per iteration.
+
+    Returns:
+        SavedUpload describing the temp file; the caller must remove() it.
+
+    Raises:
+        UnsupportedUpload: Empty upload or magic bytes not in allowed_kinds.
+        UploadTooLarge: More than max_bytes were sent.
+    """
+    first = source.read(block_size)
+    if not first:
+        raise UnsupportedUpload("Uploaded file is empty")
+    kind = sniff_kind(first[:16])
+    if kind not in allowed_kinds:
+        raise UnsupportedUpload("File content does not match a supported type")
+
+    digest = hashlib.sha256()
+    size = 0
+    temp = tempfile.NamedTemporaryFile(delete=False, suffix=KIND_EXTENSIONS[kind])
+    try:
+        with temp:
+            block = first
+            while block:
+                size += len(block)
+                if size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                digest.update(block)
+                temp.write(block)
+                block = source.read(block_size)
+    except BaseException:
+        os.remove(temp.name)
+        raise
+
+    return SavedUpload(path=temp.name, size=size, sha256=digest.hexdigest(), kind=kind)
+
+
+class MemoryBudget:
+    """
+    Per-process byte budget for uploads being received or processed.
+
+    Callers reserve their (expected) upload size for the duration of the
+    work; when the budget is exhausted new uploads wait, and are rejected
+    with UploadBackpressure if nothing frees up within the timeout.
+    A single reservation larger than the whole budget is clamped so it can
+    still run on its own.
+    """
+
+    def __init__(self, limit_bytes: int):
+        self.limit_bytes = limit_bytes
+        self._used = 0
+        self._cond = threading.Condition()
+
+    @property
+    def used(self) -> int:
+        with self._cond:
+            return self._used
+
+    @contextmanager
+    def reserve(self, nbytes: int, timeout: float) -> Iterator[None]:
+        nbytes = min(max(nbytes, 0), self.limit_bytes)
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._used + nbytes > self.limit_bytes:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise UploadBackpressure(retry_after=max(1, int(timeout)))
+                self._cond.wait(remaining)
+            self._used += nbytes
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._used -= nbytes
+                self._cond.notify_all()
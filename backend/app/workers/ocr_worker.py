@@ -0,0 +1,216 @@
+"""
+OCR Worker Pool
+
+A pre-forked pool of OCR processes serving API workers over a local socket
+(multiprocessing.connection, authenticated with OCR_WORKER_AUTHKEY). Each
+pool process imports OpenCV / Tesseract and warms Tesseract once at start,
+and CPU-bound OCR never runs on an API worker's request threads.
+
+    python -m app.workers.ocr_worker --address /run/app/ocr.sock --processes 8
+
+Uploaded files are passed by path, so the pool must run on the same box
+(and see the same temp directory) as the API workers.
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener, address_type
+
+logger = logging.getLogger(__name__)
+
+# "document": text from a PDF or image; "layout": text plus line / word boxes (images)
+OPERATIONS = ("document", "layout")
+
+
+def run_job(op: str, path: str, filename: str = "file") -> dict:
+    """Run one OCR job in the current process."""
+    if op not in OPERATIONS:
+        raise ValueError(f"Unknown OCR operation '{op}'. Choose from {list(OPERATIONS)}")
+    from app.services.ocr_service import extract_structured_from_image, extract_text_from_document
+
+    if op == "document":
+        return {"text": extract_text_from_document(path, filename)}
+    result = extract_structured_from_image(path)
+    return {"text": result.text, "layout": result.to_dict()}
+
+
+def _warm() -> None:
+    """Pool initializer: load the OCR stack and start Tesseract once."""
+    # Shutdown is driven by the parent; don't die half-way through a job on Ctrl+C
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    import pytesseract
+
+    import app.services.ocr_service  # noqa: F401
+    pytesseract.get_tesseract_version()
+
+
+def _ready(_: int) -> int:
+    return os.getpid()
+
+
+class OCRWorkerServer:
+    """Accepts API worker connections and runs their jobs on a process pool."""
+
+    def __init__(self, address: str, authkey: bytes, processes: int):
+        self.address = address
+        self.authkey = authkey
+        self.processes = max(1, processes)
+        self._pool: ProcessPoolExecutor | None = None
+        self._listener: Listener | None = None
+
+    def start(self) -> None:
+        self._pool = ProcessPoolExecutor(max_workers=self.processes, initializer=_warm)
+        # Fork and warm every process now rather than on the first requests
+        pids = set(self._pool.map(_ready, range(self.processes * 4)))
+        logger.info("OCR pool ready: %d processes", len(pids))
+
+        unix = address_type(self.address) == "AF_UNIX"
+        if unix and os.path.exists(self.address):
+            os.unlink(self.address)
+        self._listener = Listener(self.address, authkey=self.authkey)
+        if unix:
+            os.chmod(self.address, 0o600)
+
+    def serve_forever(self) -> None:
+        if self._listener is None:
+            self.start()
+        logger.info("OCR worker listening on %s", self.address)
+        while True:
+            listener = self._listener
+            if listener is None:
+                return
+            try:
+                conn = listener.accept()
+            except (OSError, EOFError, AuthenticationError):
+                # Listener closed (shutdown) or a failed handshake
+                if self._listener is None:
+                    return
+                logger.warning("Rejected OCR worker connection", exc_info=True)
+                continue
+            threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+    def _serve_connection(self, conn) -> None:
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    future = self._pool.submit(
+                        run_job, request["op"], request["path"], request.get("filename", "file")
+                    )
+                    reply = {"ok": True, "result": future.result()}
+                except ValueError as e:
+                    reply = {"ok": False, "error": str(e), "kind": "value"}
+                except Exception as e:
+                    reply = {"ok": False, "error": str(e), "kind": "error"}
+                try:
+                    conn.send(reply)
+                except OSError:
+                    # Client gave up (timeout) and closed the connection
+                    return
+
+    def close(self) -> None:
+        """Stop accepting connections and shut the pool down (call from the serving thread)."""
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.close()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+        if address_type(self.address) == "AF_UNIX" and os.path.exists(self.address):
+            os.unlink(self.address)
+
+
+class OCRWorkerClient:
+    """
+    Thread-safe client for OCRWorkerServer. Each thread keeps one
+    connection; a broken connection is reopened once per call.
+    """
+
+    def __init__(self, address: str, authkey: bytes, timeout: float = 120.0):
+        self.address = address
+        self.authkey = authkey
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = Client(self.address, authkey=self.authkey)
+            self._local.conn = conn
+        return conn
+
+    def _drop(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            conn.close()
+
+    def call(self, op: str, path: str, filename: str = "file") -> dict:
+        """
+        Run a job on the pool.
+
+        Raises:
+            ValueError: The job rejected its input (e.g. unsupported file).
+            TimeoutError: No reply within `timeout` seconds.
+            RuntimeError: The job failed.
+        """
+        request = {"op": op, "path": path, "filename": filename}
+        for attempt in range(2):
+            try:
+                conn = self._connection()
+                conn.send(request)
+                ready = conn.poll(self.timeout)
+                reply = conn.recv() if ready else None
+                break
+            except (EOFError, OSError):
+                self._drop()
+                if attempt:
+                    raise
+        if reply is None:
+            # A late reply would be read by the next call on this connection
+            self._drop()
+            raise TimeoutError(f"OCR worker did not answer within {self.timeout}s")
+
+        if reply["ok"]:
+            return reply["result"]
+        if reply["kind"] == "value":
+            raise ValueError(reply["error"])
+        raise RuntimeError(reply["error"])
+
+
+def main() -> None:
+    # The pool's processes already cover the cores; one thread per job keeps
+    # it at one Tesseract per process rather than processes x cores
+    os.environ.setdefault("OCR_JOB_THREADS", "1")
+    from app.config import OCR_WORKER_ADDRESS, OCR_WORKER_AUTHKEY, OCR_WORKER_PROCESSES
+
+    parser = argparse.ArgumentParser(description="Serve OCR jobs to API workers over a local socket.")
+    parser.add_argument("--address", default=OCR_WORKER_ADDRESS, help="Unix socket path (default: OCR_WORKER_ADDRESS)")
+    parser.add_argument("--processes", type=int, default=OCR_WORKER_PROCESSES, help="OCR processes to pre-fork")
+    args = parser.parse_args()
+    if not args.address:
+        parser.error("--address or OCR_WORKER_ADDRESS is required")
+    if not OCR_WORKER_AUTHKEY:
+        parser.error("OCR_WORKER_AUTHKEY is required")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    server = OCRWorkerServer(args.address, OCR_WORKER_AUTHKEY, args.processes)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
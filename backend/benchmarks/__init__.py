@@ -0,0 +1,11 @@
+"""
+Benchmark suite for the backend.
+
+Run from the backend directory:
+
+    python -m benchmarks.endpoints --concurrency 8 --requests 200 --output endpoints.json
+    python -m benchmarks.micro --output micro.json
+
+Provider calls go to local stand-in servers (benchmarks.fake_providers), so
+no Sarvam / Groq credentials or network access are needed.
+"""
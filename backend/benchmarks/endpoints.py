@@ -0,0 +1,197 @@
+"""
+End-to-end endpoint benchmark.
+
+Starts fake Sarvam / Groq servers, boots the FastAPI app under uvicorn on a
+local port, then drives every route in app/main.py at the requested
+concurrency and reports throughput and p50/p95/p99 latency as JSON.
+
+    python -m benchmarks.endpoints --concurrency 16 --requests 400 \\
+        --latency 0.3 --jitter 0.2 --rate-limit-rate 0.02 --output endpoints.json
+"""
+
+import argparse
+import os
+import socket
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import requests
+
+from benchmarks.common import summarize_latencies, write_report
+from benchmarks.fake_providers import (
+    add_config_arguments,
+    config_from_args,
+    start_fake_groq,
+    start_fake_sarvam,
+)
+from benchmarks.fixtures import build_fixtures, sample_text
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: str
+    # Builds requests.request() keyword arguments for the i-th request
+    build: Callable[[int], dict]
+
+
+def build_scenarios(fixtures: dict[str, Path], text_chars: int, identical: bool) -> list[Scenario]:
+    base_text = sample_text(text_chars)
+
+    def text(i: int) -> str:
+        # Distinct payloads by default so request coalescing does not flatter the numbers:
+        # every paragraph carries the request index, so every provider-sized chunk differs
+        return base_text if identical else sample_text(text_chars, tag=i)
+
+    def upload(key: str, filename: str, content_type: str) -> Callable[[int], dict]:
+        data = fixtures[key].read_bytes()
+        return lambda i: {"files": {"file": (filename, data, content_type)}}
+
+    return [
+        Scenario("health", "GET", "/health", lambda i: {}),
+        Scenario("languages", "GET", "/languages", lambda i: {}),
+        Scenario("translate", "POST", "/translate",
+                 lambda i: {"json": {"text": text(i), "target_language_code": "hi-IN"}}),
+        Scenario("translate_pipeline", "POST", "/translate-pipeline",
+                 lambda i: {"json": {"text": text(i), "target_lang": "hi"}}),
+        Scenario("summarize", "POST", "/summarize", lambda i: {"json": {"text": text(i)}}),
+        Scenario("explain", "POST", "/explain",
+                 lambda i: {"json": {"text": text(i), "audience": "student"}}),
+        Scenario("ai_analyze", "POST", "/ai-analyze",
+                 lambda i: {"json": {"text": text(i), "audience": "general"}}),
+        Scenario("speech_to_text", "POST", "/speech-to-text",
+                 upload("audio", "speech.wav", "audio/wav")),
+        Scenario("image_to_text_image", "POST", "/image-to-text",
+                 upload("image", "document.png", "image/png")),
+        Scenario("image_to_text_pdf", "POST", "/image-to-text",
+                 upload("pdf", "document.pdf", "application/pdf")),
+        Scenario("metrics", "GET", "/metrics", lambda i: {}),
+    ]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_app(port: int):
+    """Run the app under uvicorn in a background thread and wait until it serves."""
+    import uvicorn
+    from app.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("uvicorn did not start within 30s")
+        time.sleep(0.05)
+    return server, thread
+
+
+def run_scenario(base_url: str, scenario: Scenario, total: int, concurrency: int, warmup: int) -> dict:
+    local = threading.local()
+
+    def one(i: int) -> tuple[float, int]:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        start = time.perf_counter()
+        try:
+            response = session.request(
+                scenario.method, base_url + scenario.path, timeout=120, **scenario.build(i)
+            )
+            status = response.status_code
+        except requests.RequestException:
+            status = 0
+        return time.perf_counter() - start, status
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(-warmup, 0)))
+        start = time.perf_counter()
+        outcomes = list(pool.map(one, range(total)))
+        wall = time.perf_counter() - start
+
+    statuses: dict[str, int] = {}
+    for _, status in outcomes:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    ok_latencies = [latency for latency, status in outcomes if 200 <= status < 300]
+
+    return {
+        "scenario": scenario.name,
+        "method": scenario.method,
+        "path": scenario.path,
+        "requests": total,
+        "concurrency": concurrency,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(total / wall, 3) if wall else None,
+        "success_rate": round(len(ok_latencies) / total, 4) if total else None,
+        "status_counts": statuses,
+        "latency": summarize_latencies(ok_latencies),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark every API endpoint against fake providers")
+    add_config_arguments(parser)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--text-chars", type=int, default=2500, help="size of text payloads")
+    parser.add_argument("--identical", action="store_true",
+                        help="send identical payloads (exercises request coalescing)")
+    parser.add_argument("--scenarios", nargs="*", help="only run these scenario names")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    provider_config = config_from_args(args)
+    sarvam = start_fake_sarvam(provider_config)
+    groq = start_fake_groq(provider_config)
+
+    # Must be set before app modules are imported (config is read at import)
+    os.environ["SARVAM_BASE_URL"] = sarvam.url
+    os.environ["GROQ_BASE_URL"] = groq.url
+    os.environ.setdefault("SARVAM_API_KEY", "benchmark")
+    os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+    port = _free_port()
+    server, thread = start_app(port)
+    base_url = f"http://127.0.0.1:{port}"
+
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            fixtures = build_fixtures(tmp)
+            for scenario in build_scenarios(fixtures, args.text_chars, args.identical):
+                if args.scenarios and scenario.name not in args.scenarios:
+                    continue
+                before = (sarvam.request_count, groq.request_count)
+                result = run_scenario(base_url, scenario, args.requests, args.concurrency, args.warmup)
+                # Upstream calls made during this scenario (warmup included)
+                result["provider_requests"] = {
+                    "sarvam": sarvam.request_count - before[0],
+                    "groq": groq.request_count - before[1],
+                }
+                results.append(result)
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+        sarvam.stop()
+        groq.stop()
+
+    config = {
+        key: value for key, value in vars(args).items() if key not in ("output", "scenarios")
+    }
+    write_report("endpoints", config, results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Local stand-ins for the Sarvam and Groq HTTP APIs.
+
+Each server answers the endpoints the app uses with well-formed responses
+after a configurable delay, and can inject 5xx errors and 429s at given
+rates. Point the app at them with SARVAM_BASE_URL / GROQ_BASE_URL.
+
+Standalone use:
+
+    python -m benchmarks.fake_providers --latency 0.3 --jitter 0.1 --error-rate 0.01
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+@dataclass
+class FakeProviderConfig:
+    latency: float = 0.2        # mean response delay, seconds
+    jitter: float = 0.05        # uniform +/- jitter around latency, seconds
+    error_rate: float = 0.0     # fraction of requests answered with 500
+    rate_limit_rate: float = 0.0  # fraction of requests answered with 429
+    seed: int | None = None
+
+
+FAKE_ANALYSIS = {
+    "type": "medical",
+    "medical": {
+        "normal": ["Hemoglobin: 14 g/dL (13-17)"],
+        "abnormal": ["Glucose: 180 mg/dL (HIGH -> possible diabetes)"],
+        "explanation": "Blood sugar is high. Consult a doctor.",
+    },
+    "legal": {"rights": [], "obligations": [], "penalties": [], "urgency": "low"},
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "FakeProviderServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002 - silence default access log
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: dict | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):  # noqa: N802 - http.server naming
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        injected = self.server.simulate()
+        if injected == 429:
+            self._send_json(429, {"error": {"message": "rate limited"}}, {"Retry-After": "0"})
+            return
+        if injected == 500:
+            self._send_json(500, {"error": {"message": "injected failure"}})
+            return
+
+        handler = self.server.routes.get(self.path.split("?", 1)[0])
+        if handler is None:
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+        self._send_json(200, handler(body, self.headers.get("Content-Type", "")))
+
+
+class FakeProviderServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, routes: dict, config: FakeProviderConfig, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _Handler)
+        self.routes = routes
+        self.config = config
+        self._random = random.Random(config.seed)
+        self._random_lock = threading.Lock()
+        self.request_count = 0
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def simulate(self) -> int | None:
+        """Sleep for the configured latency; return an injected status, if any."""
+        config = self.config
+        with self._random_lock:
+            self.request_count += 1
+            delay = max(0.0, config.latency + self._random.uniform(-config.jitter, config.jitter))
+            roll = self._random.random()
+        time.sleep(delay)
+        if roll < config.rate_limit_rate:
+            return 429
+        if roll < config.rate_limit_rate + config.error_rate:
+            return 500
+        return None
+
+    def start(self) -> "FakeProviderServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+# -------- SARVAM --------
+
+def _sarvam_translate(body: bytes, content_type: str) -> dict:
+    payload = json.loads(body or b"{}")
+    text = payload.get("input", "")
+    return {
+        "request_id": uuid.uuid4().hex,
+        # Deterministic "translation" with roughly the input length
+        "translated_text": "अनुवाद " + text[::-1],
+        "source_language_code": "en-IN",
+    }
+
+
+def _sarvam_speech_to_text(body: bytes, content_type: str) -> dict:
+    return {
+        "request_id": uuid.uuid4().hex,
+        "transcript": "यह एक परीक्षण प्रतिलेख है",
+        "language_code": "hi-IN",
+    }
+
+
+def start_fake_sarvam(config: FakeProviderConfig, port: int = 0) -> FakeProviderServer:
+    routes = {
+        "/translate": _sarvam_translate,
+        "/speech-to-text": _sarvam_speech_to_text,
+    }
+    return FakeProviderServer(routes, config, port=port).start()
+
+
+# -------- GROQ --------
+
+def _groq_chat_completion(body: bytes, content_type: str) -> dict:
+    payload = json.loads(body or b"{}")
+    messages = payload.get("messages", [])
+    wants_json = any("JSON" in str(message.get("content", "")) for message in messages)
+    content = (
+        json.dumps(FAKE_ANALYSIS)
+        if wants_json
+        else "This is a short summary.\nIt has four lines.\nThey are simple.\nThe end."
+    )
+    now = int(time.time())
+    return {
+        "id": "chatcmpl-" + uuid.uuid4().hex,
+        "object": "chat.completion",
+        "created": now,
+        "model": payload.get("model", "llama-3.1-8b-instant"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "logprobs": None,
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150},
+        "system_fingerprint": "fp_fake",
+        "x_groq": {"id": "req_" + uuid.uuid4().hex},
+    }
+
+
+def start_fake_groq(config: FakeProviderConfig, port: int = 0) -> FakeProviderServer:
+    routes = {"/openai/v1/chat/completions": _groq_chat_completion}
+    return FakeProviderServer(routes, config, port=port).start()
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", type=float, default=0.2, help="mean provider latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.05, help="uniform latency jitter (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of 429 responses")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def config_from_args(args: argparse.Namespace) -> FakeProviderConfig:
+    return FakeProviderConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run fake Sarvam and Groq servers")
+    add_config_arguments(parser)
+    parser.add_argument("--sarvam-port", type=int, default=8701)
+    parser.add_argument("--groq-port", type=int, default=8702)
+    args = parser.parse_args()
+
+    config = config_from_args(args)
+    sarvam = start_fake_sarvam(config, args.sarvam_port)
+    groq = start_fake_groq(config, args.groq_port)
+    print(f"SARVAM_BASE_URL={sarvam.url}")
+    print(f"GROQ_BASE_URL={groq.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        sarvam.stop()
+        groq.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark fixtures, generated on demand so no binaries live in the repo.
+
+build_fixtures(directory) writes:
+    document.png   - rendered multi-line text page (OCR / preprocessing input)
+    document.pdf   - multi-page PDF with a text layer
+    speech.wav     - 16 kHz mono tone
+and returns their paths plus a sample of plain text.
+"""
+
+import math
+import struct
+import wave
+from pathlib import Path
+
+SAMPLE_PARAGRAPH = (
+    "This is a government notice regarding land ownership. "
+    "All residents must submit their documents to the district office "
+    "before the end of the month. Failure to comply may result in a penalty. "
+)
+
+
+def sample_text(chars: int, tag: object = None) -> str:
+    """
+    Repeat SAMPLE_PARAGRAPH up to roughly `chars` characters.
+
+    With a tag, every repeat is prefixed "(<tag>.<n>)", so no stretch of
+    text longer than a paragraph repeats within or across tagged texts.
+    """
+    if tag is None:
+        repeats = chars // len(SAMPLE_PARAGRAPH) + 1
+        return (SAMPLE_PARAGRAPH * repeats)[:chars].strip()
+    paragraphs = []
+    total = 0
+    while total < chars:
+        paragraphs.append(f"({tag}.{len(paragraphs)}) {SAMPLE_PARAGRAPH}")
+        total += len(paragraphs[-1])
+    return "".join(paragraphs)[:chars].strip()
+
+
+def write_image(path: Path, lines: int = 30, width: int = 1240, height: int = 1754) -> Path:
+    import cv2
+    import numpy as np
+
+    page = np.full((height, width, 3), 255, dtype=np.uint8)
+    words = SAMPLE_PARAGRAPH.split()
+    for row in range(lines):
+        line = " ".join(words[(row * 7) % len(words):][:9])
+        y = 80 + row * (height - 160) // lines
+        cv2.putText(page, line, (60, y), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 0), 2, cv2.LINE_AA)
+    cv2.imwrite(str(path), page)
+    return path
+
+
+def write_pdf(path: Path, pages: int = 10) -> Path:
+    import fitz
+
+    doc = fitz.open()
+    try:
+        for index in range(pages):
+            page = doc.new_page()
+            text = f"Page {index + 1}\n" + "\n".join(
+                SAMPLE_PARAGRAPH[i:i + 80] for i in range(0, len(SAMPLE_PARAGRAPH), 80)
+            ) * 4
+            page.insert_text((50, 72), text, fontsize=11)
+        doc.save(str(path))
+    finally:
+        doc.close()
+    return path
+
+
+def write_wav(path: Path, seconds: float = 3.0, sample_rate: int = 16000) -> Path:
+    frames = bytearray()
+    for i in range(int(seconds * sample_rate)):
+        sample = int(8000 * math.sin(2 * math.pi * 440 * i / sample_rate))
+        frames += struct.pack("<h", sample)
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(bytes(frames))
+    return path
+
+
+def build_fixtures(directory: str | Path) -> dict[str, Path]:
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    return {
+        "image": write_image(directory / "document.png"),
+        "pdf": write_pdf(directory / "document.pdf"),
+        "audio": write_wav(directory / "speech.wav"),
+    }
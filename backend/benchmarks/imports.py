@@ -0,0 +1,73 @@
+"""
+Import-time / cold-start benchmark.
+
+For each worker role, spawns fresh interpreters that import app.main with
+APP_ROLES set accordingly, and reports wall-clock import time plus which
+heavy third-party stacks ended up loaded.
+
+    python -m benchmarks.imports --repeat 5 --output imports.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.common import summarize_latencies, write_report
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ("cv2", "numpy", "pytesseract", "fitz", "groq", "sarvamai")
+
+ROLE_SETS = ("all", "translation", "speech", "ocr", "llm")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "seconds": elapsed,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+"""
+
+
+def probe(roles: str, preload: bool) -> dict:
+    env = dict(os.environ)
+    env.setdefault("SARVAM_API_KEY", "benchmark")
+    env["APP_ROLES"] = roles
+    env["APP_PRELOAD"] = "true" if preload else "false"
+    output = subprocess.check_output(
+        [sys.executable, "-c", _PROBE % (HEAVY_MODULES,)],
+        cwd=BACKEND_DIR,
+        env=env,
+        text=True,
+    )
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure app.main import time per worker role")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per configuration")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    results = []
+    for roles in ROLE_SETS:
+        for preload in (False, True):
+            samples = [probe(roles, preload) for _ in range(args.repeat)]
+            results.append({
+                "roles": roles,
+                "preload": preload,
+                "latency": summarize_latencies([sample["seconds"] for sample in samples]),
+                "heavy_modules_loaded": samples[-1]["loaded"],
+            })
+
+    write_report("imports", {"repeat": args.repeat}, results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Micro-benchmarks for CPU-bound helpers: chunk_text, preprocess_image and
+extract_text_from_pdf, plus script detection and image OCR when a Tesseract
+binary is installed. No providers are involved.
+
+    python -m benchmarks.micro --iterations 50 --output micro.json
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable
+
+from benchmarks.common import summarize_latencies, write_report
+from benchmarks.fixtures import build_fixtures, sample_text
+
+
+def measure(name: str, fn: Callable[[], object], iterations: int, warmup: int = 2, **params) -> dict:
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {"benchmark": name, "params": params, "iterations": iterations,
+            "latency": summarize_latencies(timings)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for chunking, preprocessing and PDF extraction")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    # app.config requires a key even though nothing here calls a provider
+    os.environ.setdefault("SARVAM_API_KEY", "benchmark")
+
+    import pytesseract
+
+    from app.services.ocr_service import detect_script, extract_text_from_image, extract_text_from_pdf
+    from app.services.preprocessing import preprocess_image, preprocess_images
+    from app.utils.chunking import chunk_text
+
+    results = []
+    for chars in (1_000, 100_000, 1_000_000):
+        text = sample_text(chars)
+        results.append(measure(
+            "chunk_text", lambda: chunk_text(text, 900), args.iterations, chars=chars, max_chars=900
+        ))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = build_fixtures(tmp)
+        image_path = str(fixtures["image"])
+        pdf_path = str(fixtures["pdf"])
+        results.append(measure(
+            "preprocess_image", lambda: preprocess_image(image_path), args.iterations,
+            image=fixtures["image"].name,
+        ))
+        batch = [image_path] * 8
+        results.append(measure(
+            "preprocess_images", lambda: preprocess_images(batch, lambda i, img: img.shape),
+            args.iterations, image=fixtures["image"].name, batch_size=len(batch),
+        ))
+        results.append(measure(
+            "extract_text_from_pdf", lambda: extract_text_from_pdf(pdf_path), args.iterations,
+            pdf=fixtures["pdf"].name,
+        ))
+
+        try:
+            pytesseract.get_tesseract_version()
+        except Exception:
+            pass  # No Tesseract binary: skip the OCR cases
+        else:
+            preprocessed = preprocess_image(image_path)
+            results.append(measure(
+                "detect_script", lambda: detect_script(preprocessed), args.iterations,
+                image=fixtures["image"].name,
+            ))
+            results.append(measure(
+                "extract_text_from_image", lambda: extract_text_from_image(image_path), args.iterations,
+                image=fixtures["image"].name,
+            ))
+
+    write_report("micro", {"iterations": args.iterations}, results, args.output)
+
+
+if __name__ == "__main__":
+    main()
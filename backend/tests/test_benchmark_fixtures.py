@@ -0,0 +1,11 @@
+from app.utils.chunking import chunk_text
+from benchmarks.fixtures import sample_text
+
+
+def test_tagged_sample_texts_share_no_provider_chunks():
+    chunks = [chunk for i in range(25) for chunk in chunk_text(sample_text(2500, tag=i), 900)]
+
+    # Every chunk of every request is distinct, so none can be coalesced or cached
+    assert len(chunks) == 75
+    assert len(set(chunks)) == len(chunks)
+    assert len(sample_text(2500, tag=3)) <= 2500
@@ -0,0 +1,112 @@
+import threading
+import time
+
+import pytest
+
+from app.utils.fair_scheduler import FairScheduler, Overloaded
+
+
+def _queue(scheduler: FairScheduler, client: str, cost: float, order: list) -> threading.Thread:
+    """Start a thread that takes a slot, records the grant and releases at once."""
+    expected = scheduler.queued() + 1
+
+    def run():
+        scheduler.acquire(client, cost)
+        order.append(client)
+        scheduler.release(client)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    while scheduler.queued() < expected:
+        time.sleep(0.001)
+    return thread
+
+
+def test_backlogged_client_does_not_starve_others():
+    scheduler = FairScheduler(capacity=1, per_client_limit=1, max_wait=5)
+    scheduler.acquire("batch", 500)
+    order: list[str] = []
+    threads = [_queue(scheduler, "batch", 500, order) for _ in range(3)]
+    threads.append(_queue(scheduler, "interactive", 50, order))
+
+    scheduler.release("batch")
+    for thread in threads:
+        thread.join(5)
+
+    assert order[0] == "interactive"
+    assert order.count("batch") == 3
+
+
+def test_weights_scale_fair_share():
+    scheduler = FairScheduler(capacity=1, per_client_limit=1, max_wait=5, weights={"gold": 4})
+    scheduler.acquire("holder")
+    order: list[str] = []
+    threads = [_queue(scheduler, "bronze", 100, order) for _ in range(2)]
+    threads += [_queue(scheduler, "gold", 100, order) for _ in range(4)]
+
+    scheduler.release("holder")
+    for thread in threads:
+        thread.join(5)
+
+    # Finish tags: gold 25, 50, 75, 100; bronze 100, 200 (ties go to the earlier arrival)
+    assert order == ["gold", "gold", "gold", "bronze", "gold", "bronze"]
+
+
+def test_per_client_limit_leaves_capacity_for_others():
+    scheduler = FairScheduler(capacity=4, per_client_limit=1, max_wait=0.1)
+    scheduler.acquire("a")
+
+    assert scheduler.acquire("b") < 0.05
+    with pytest.raises(Overloaded) as excinfo:
+        scheduler.acquire("a")
+    assert excinfo.value.reason == "deadline"
+    assert scheduler.queued() == 0
+    assert scheduler.in_flight() == 2
+
+
+def test_character_budget_sheds_with_retry_after():
+    scheduler = FairScheduler(capacity=4, per_client_limit=4, max_wait=1, char_rate=10, char_burst=100)
+    scheduler.acquire("a", 100)
+    scheduler.release("a")
+
+    with pytest.raises(Overloaded) as excinfo:
+        scheduler.acquire("a", 50)
+    assert excinfo.value.reason == "quota"
+    assert 4 <= excinfo.value.retry_after <= 5
+    # Other clients have their own budget
+    scheduler.acquire("b", 100)
+
+
+def test_full_queue_is_shed_immediately():
+    scheduler = FairScheduler(capacity=1, per_client_limit=1, max_wait=5, max_queue=1)
+    scheduler.acquire("a")
+    order: list[str] = []
+    thread = _queue(scheduler, "b", 1, order)
+
+    with pytest.raises(Overloaded) as excinfo:
+        scheduler.acquire("c")
+    assert excinfo.value.reason == "queue_full"
+
+    scheduler.release("a")
+    thread.join(5)
+    assert order == ["b"]
+
+
+def test_flooding_client_is_shed_while_others_are_admitted():
+    scheduler = FairScheduler(capacity=2, per_client_limit=1, max_wait=5, per_client_queue=2)
+    scheduler.acquire("flood")
+    order: list[str] = []
+    threads = [_queue(scheduler, "flood", 1, order) for _ in range(2)]
+
+    started = time.monotonic()
+    with pytest.raises(Overloaded) as excinfo:
+        scheduler.acquire("flood")
+    assert excinfo.value.reason == "client_queue_full"
+    assert time.monotonic() - started < 0.5
+
+    assert scheduler.acquire("interactive") < 0.05
+    scheduler.release("interactive")
+    scheduler.release("flood")
+    for thread in threads:
+        thread.join(5)
+    assert order == ["flood", "flood"]
@@ -0,0 +1,25 @@
+import pytest
+
+from app.sarvam_client import sarvam_environment
+from benchmarks.fake_providers import FakeProviderConfig, start_fake_sarvam
+
+sarvamai = pytest.importorskip("sarvamai")
+
+
+def test_sarvam_sdk_round_trip_against_fake_server(tmp_path):
+    server = start_fake_sarvam(FakeProviderConfig(latency=0, jitter=0))
+    try:
+        client = sarvamai.SarvamAI(api_subscription_key="test", environment=sarvam_environment(server.url))
+
+        translated = client.text.translate(
+            input="notice", source_language_code="en-IN", target_language_code="hi-IN"
+        )
+        assert translated.translated_text == "अनुवाद " + "notice"[::-1]
+
+        audio = tmp_path / "clip.wav"
+        audio.write_bytes(b"RIFF\x00\x00\x00\x00WAVE")
+        with open(audio, "rb") as audio_file:
+            transcript = client.speech_to_text.transcribe(file=audio_file, language_code="hi-IN")
+        assert transcript.transcript
+    finally:
+        server.stop()
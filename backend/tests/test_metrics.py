@@ -0,0 +1,32 @@
+from app.utils.metrics import Counter, Gauge, HistogramMetric, render_metrics, stage_timer
+
+
+def test_render_prometheus_text_format():
+    requests = Counter("test_requests_total", "Test requests.", ("route",))
+    requests.labels(route="/translate").inc()
+    requests.labels(route="/translate").inc(2)
+    latency = HistogramMetric("test_latency_seconds", "Test latency.", buckets=(0.1, 1.0))
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5.0)
+    queued = Gauge("test_queued", "Test queue.", ("pool",))
+    queued.set_function(lambda: 3, pool="ocr")
+
+    text = render_metrics()
+
+    assert "# TYPE test_requests_total counter" in text
+    assert 'test_requests_total{route="/translate"} 3' in text
+    assert 'test_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "test_latency_seconds_count 3" in text
+    assert 'test_queued{pool="ocr"} 3' in text
+
+
+def test_stage_timer_records_failures():
+    try:
+        with stage_timer("test.failing_stage"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert 'stage_duration_seconds_count{stage="test.failing_stage"} 1' in render_metrics()
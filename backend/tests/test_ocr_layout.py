@@ -0,0 +1,73 @@
+import numpy as np
+
+from app.services import ocr_layout
+from app.services.ocr_layout import OCRLine, OCRResult, OCRWord, parse_image_data
+
+
+def _data(rows):
+    keys = ("level", "block_num", "par_num", "line_num", "left", "top", "width", "height", "conf", "text")
+    return {key: [row[i] for row in rows] for i, key in enumerate(keys)}
+
+
+def test_parse_image_data_groups_words_into_lines():
+    data = _data([
+        (4, 1, 1, 1, 0, 0, 200, 20, "-1", ""),
+        (5, 1, 1, 1, 10, 5, 40, 20, "96.5", "Blood"),
+        (5, 1, 1, 1, 60, 5, 50, 20, "91", "Sugar"),
+        (5, 1, 1, 2, 10, 40, 30, 20, "42", "l8O"),
+        (5, 1, 1, 2, 50, 40, 30, 20, "-1", " "),
+    ])
+
+    lines = parse_image_data(data)
+
+    assert [line.text for line in lines] == ["Blood Sugar", "l8O"]
+    assert lines[0].bbox == (10, 5, 100, 20)
+    assert round(lines[0].confidence, 2) == 93.75
+    assert lines[1].confidence == 42.0
+
+
+def test_parse_image_data_maps_crop_coordinates_back():
+    data = _data([(5, 1, 1, 1, 20, 10, 40, 16, "88", "180")])
+
+    (line,) = parse_image_data(data, offset=(100, 200), scale=2.0)
+
+    assert line.words[0].left == 110
+    assert line.words[0].top == 205
+    assert (line.words[0].width, line.words[0].height) == (20, 8)
+
+
+def test_result_serialises_boxes_in_original_coordinates():
+    result = OCRResult(
+        lang="eng",
+        lines=[OCRLine(words=[OCRWord("Total", 90.0, 18, 36, 90, 18)])],
+        scale=1.8,
+    )
+
+    payload = result.to_dict()
+
+    assert result.text == "Total"
+    assert payload["lines"][0]["bbox"] == [10, 20, 50, 10]
+    assert payload["lines"][0]["refined"] is False
+
+
+def test_refine_replaces_only_weak_lines_with_better_readings(monkeypatch):
+    strong = OCRLine(words=[OCRWord("Glucose", 95.0, 10, 10, 60, 20)])
+    improvable = OCRLine(words=[OCRWord("l8O", 40.0, 10, 50, 30, 20)])
+    hopeless = OCRLine(words=[OCRWord("mg/dL", 50.0, 10, 90, 50, 20)])
+    result = OCRResult(lang="hin", lines=[strong, improvable, hopeless])
+    calls = []
+
+    def image_to_data(crop, lang, config, output_type):
+        calls.append(lang)
+        # Lines are refined weakest first: "l8O", then "mg/dL"
+        text, conf = ("180", "91") if len(calls) <= 2 else ("rng/dL", "30")
+        return _data([(5, 1, 1, 1, 4, 4, 60, 40, conf, text)])
+
+    monkeypatch.setattr(ocr_layout.pytesseract, "image_to_data", image_to_data)
+
+    replaced = ocr_layout.refine_low_confidence(np.zeros((120, 100), dtype=np.uint8), result, "hin+eng")
+
+    assert replaced == 1
+    assert calls == ["hin", "hin+eng", "hin", "hin+eng"]
+    assert [line.text for line in result.lines] == ["Glucose", "180", "mg/dL"]
+    assert [line.refined for line in result.lines] == [False, True, False]
@@ -0,0 +1,66 @@
+import numpy as np
+
+from app.services import ocr_service
+
+
+def _must_not_run(*args, **kwargs):
+    raise AssertionError("Tesseract should not run")
+
+
+def test_hint_text_skips_osd(monkeypatch):
+    monkeypatch.setattr(ocr_service.pytesseract, "image_to_string", _must_not_run)
+    monkeypatch.setattr(ocr_service.pytesseract, "image_to_osd", _must_not_run)
+    img = np.full((50, 50), 255, dtype=np.uint8)
+
+    assert ocr_service.detect_script(img, hint_text="ಇದು ಭೂ ಮಾಲೀಕತ್ವದ ಕುರಿತು ಸರ್ಕಾರಿ ಸೂಚನೆ") == "kan"
+
+
+def test_without_hint_one_osd_call_decides(monkeypatch):
+    calls = []
+
+    def image_to_osd(img):
+        calls.append(img.shape)
+        return "Script: Devanagari"
+
+    monkeypatch.setattr(ocr_service.pytesseract, "image_to_string", _must_not_run)
+    monkeypatch.setattr(ocr_service.pytesseract, "image_to_osd", image_to_osd)
+    img = np.full((60, 60), 255, dtype=np.uint8)
+
+    assert ocr_service.detect_script(img, hint_text="1 2 3") == "hin"
+    assert calls == [(60, 60)]
+
+
+class _Page:
+    def __init__(self, number, text):
+        self.number = number
+        self.text = text
+
+    def get_text(self):
+        return self.text
+
+
+class _Doc(list):
+    def close(self):
+        pass
+
+
+def test_pdf_ocr_is_capped_at_max_ocr_pages(monkeypatch, tmp_path):
+    pages = _Doc([_Page(0, "नमस्ते यह एक सरकारी सूचना है"), _Page(1, ""), _Page(2, " "), _Page(3, "")])
+    pdf = tmp_path / "scan.pdf"
+    pdf.write_bytes(b"%PDF-1.7")
+    ocr_batches = []
+
+    def extract_text_from_images(images, lang=None):
+        ocr_batches.append((list(images), lang))
+        return [f"ocr {number}" for number in images]
+
+    monkeypatch.setattr(ocr_service, "fitz", type("fitz", (), {"open": staticmethod(lambda path: pages)}))
+    monkeypatch.setattr(ocr_service, "_rasterize_gray", lambda page: page.number)
+    monkeypatch.setattr(ocr_service, "extract_text_from_images", extract_text_from_images)
+
+    assert ocr_service.extract_text_from_pdf(str(pdf), max_ocr_pages=0) == "नमस्ते यह एक सरकारी सूचना है"
+    assert ocr_batches == []
+
+    text = ocr_service.extract_text_from_pdf(str(pdf), max_ocr_pages=2)
+    assert text == "नमस्ते यह एक सरकारी सूचना है\nocr 1\nocr 2"
+    assert ocr_batches == [([1, 2], "hin")]
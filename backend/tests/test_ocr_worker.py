@@ -0,0 +1,53 @@
+import threading
+from multiprocessing.connection import Listener
+
+import pytest
+
+from app.workers.ocr_worker import OCRWorkerClient
+
+AUTHKEY = b"test"
+
+
+def _fake_pool(address: str, replies: list, connections: int) -> threading.Thread:
+    """Answers each request with the next reply; closes after each connection's requests."""
+    listener = Listener(address, authkey=AUTHKEY)
+
+    def serve():
+        with listener:
+            for _ in range(connections):
+                with listener.accept() as conn:
+                    while replies:
+                        request = conn.recv()
+                        reply = replies.pop(0)
+                        if reply is None:
+                            break   # drop the connection mid-request
+                        conn.send(dict(reply, echo=request))
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_client_round_trip_and_error_mapping(tmp_path):
+    address = str(tmp_path / "ocr.sock")
+    replies = [
+        {"ok": True, "result": {"text": "hello"}},
+        {"ok": False, "error": "Unsupported file type", "kind": "value"},
+        {"ok": False, "error": "tesseract crashed", "kind": "error"},
+    ]
+    _fake_pool(address, replies, connections=1)
+    client = OCRWorkerClient(address, AUTHKEY, timeout=5)
+
+    assert client.call("document", "/tmp/a.png", "a.png") == {"text": "hello"}
+    with pytest.raises(ValueError, match="Unsupported"):
+        client.call("document", "/tmp/a.txt", "a.txt")
+    with pytest.raises(RuntimeError, match="crashed"):
+        client.call("layout", "/tmp/a.png")
+
+
+def test_client_reconnects_after_dropped_connection(tmp_path):
+    address = str(tmp_path / "ocr.sock")
+    _fake_pool(address, [None, {"ok": True, "result": {"text": "again"}}], connections=2)
+    client = OCRWorkerClient(address, AUTHKEY, timeout=5)
+
+    assert client.call("document", "/tmp/a.png") == {"text": "again"}
@@ -0,0 +1,51 @@
+import cv2
+import numpy as np
+
+from app.services.preprocessing import BufferPool, preprocess_image, preprocess_images
+
+
+def _page(seed, shape):
+    return np.random.default_rng(seed).integers(0, 256, shape, dtype=np.uint8)
+
+
+def test_preprocess_images_matches_preprocess_image(tmp_path):
+    pages = [_page(0, (40, 30, 3)), _page(1, (40, 30, 3)), _page(2, (25, 50))]
+    paths = []
+    for index, page in enumerate(pages):
+        path = str(tmp_path / f"page{index}.png")
+        cv2.imwrite(path, page)
+        paths.append(path)
+    expected = [preprocess_image(path) for path in paths]
+
+    for sources in (paths, [open(path, "rb").read() for path in paths]):
+        results = preprocess_images(sources, lambda index, img: img.copy(), max_workers=2, pool=BufferPool())
+        for got, want in zip(results, expected):
+            np.testing.assert_array_equal(got, want)
+
+
+def test_preprocess_images_reuses_and_releases_buffers():
+    pool = BufferPool()
+    seen = []
+    pages = [_page(seed, (20, 20)) for seed in range(4)]
+
+    preprocess_images(pages, lambda index, img: seen.append(id(img)), max_workers=1, pool=pool)
+
+    # One output buffer, handed back after each page and leased again for the next
+    assert len(set(seen)) == 1
+    assert pool.idle_bytes == 36 * 36
+
+
+def test_buffer_pool_drops_least_recently_used_shapes_past_max_bytes():
+    pool = BufferPool(max_bytes=250)
+    small, other, big = np.empty((10, 10), np.uint8), np.empty((10, 10), np.uint8), np.empty((15, 10), np.uint8)
+
+    pool.release(small)
+    pool.release(other)
+    pool.release(big)
+
+    assert pool.idle_bytes == 250
+    assert pool.acquire((15, 10)) is big
+    assert pool.acquire((10, 10)) is other
+    assert pool.acquire((10, 10)) is not small
+    pool.release(np.empty((30, 10), np.uint8))   # larger than the pool: never kept
+    assert pool.idle_bytes == 0
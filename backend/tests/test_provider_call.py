@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+from app.services import provider_call
+from app.utils.fair_scheduler import FairScheduler, Overloaded
+from app.utils.histogram import Histogram, RollingHistogram
+from app.utils.singleflight import SingleFlight, coalesce
+from app.utils.tracing import set_client_id
+
+
+def test_histogram_percentile_interpolates_within_bucket():
+    histogram = Histogram(buckets=(1.0, 2.0, 4.0))
+    for value in (0.5, 1.5, 1.5, 3.0):
+        histogram.observe(value)
+
+    assert histogram.count == 4
+    assert histogram.percentile(0.5) == pytest.approx(1.5)
+    assert histogram.percentile(1.0) == pytest.approx(4.0)
+
+
+def test_rolling_histogram_forgets_old_windows():
+    histogram = RollingHistogram(window_seconds=0.05, buckets=(1.0,))
+    histogram.observe(0.5)
+    time.sleep(0.12)
+    assert histogram.count == 0
+
+
+def test_hedge_budget_caps_extra_calls():
+    budget = provider_call.HedgeBudget(ratio=0.5, burst=1.0)
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    budget.record_request()
+    budget.record_request()
+    assert budget.try_spend()
+
+
+def test_slow_primary_is_hedged(monkeypatch):
+    monkeypatch.setattr(provider_call, "HEDGING_ENABLED", True)
+    monkeypatch.setattr(provider_call, "hedge_delay", lambda provider: 0.05)
+    monkeypatch.setattr(provider_call, "_budget", provider_call.HedgeBudget(1.0, 5.0))
+
+    calls = []
+
+    def fn():
+        calls.append(None)
+        if len(calls) == 1:
+            time.sleep(1.0)
+            return "slow"
+        return "fast"
+
+    start = time.perf_counter()
+    assert provider_call.call_provider("test-hedge", fn) == "fast"
+    assert time.perf_counter() - start < 0.5
+
+
+def test_hedge_falls_back_when_first_finisher_fails(monkeypatch):
+    monkeypatch.setattr(provider_call, "HEDGING_ENABLED", True)
+    monkeypatch.setattr(provider_call, "hedge_delay", lambda provider: 0.05)
+    monkeypatch.setattr(provider_call, "_budget", provider_call.HedgeBudget(1.0, 5.0))
+
+    calls = []
+
+    def fn():
+        calls.append(None)
+        if len(calls) == 1:
+            time.sleep(0.2)
+            return "primary"
+        raise RuntimeError("backup failed")
+
+    assert provider_call.call_provider("test-fallback", fn) == "primary"
+
+
+def test_follower_of_shed_leader_is_scheduled_as_itself(monkeypatch):
+    scheduler = FairScheduler(capacity=4, per_client_limit=1, max_wait=0.3)
+    monkeypatch.setattr(provider_call, "SCHEDULER_ENABLED", True)
+    monkeypatch.setattr(provider_call, "HEDGING_ENABLED", False)
+    monkeypatch.setattr(provider_call, "_scheduler", scheduler)
+    group = SingleFlight()
+
+    @coalesce("test.popular", group=group)
+    def translate(text: str) -> str:
+        return provider_call.call_provider("test-coalesce", lambda: time.sleep(0.05) or text.upper())
+
+    outcomes = {}
+
+    def request(client: str) -> None:
+        set_client_id(client)
+        try:
+            outcomes[client] = translate("popular notice")
+        except Overloaded as e:
+            outcomes[client] = e.reason
+
+    # Client A already has a call running, so its request for the notice queues and is shed
+    scheduler.acquire("a")
+    heavy = threading.Thread(target=request, args=("a",))
+    heavy.start()
+    time.sleep(0.05)
+    idle = threading.Thread(target=request, args=("b",))
+    idle.start()
+    heavy.join()
+    idle.join()
+    scheduler.release("a")
+
+    assert outcomes == {"a": "deadline", "b": "POPULAR NOTICE"}
@@ -0,0 +1,45 @@
+from app.utils.script_detection import (
+    detect_script,
+    guess_language_code,
+    guess_tesseract_lang,
+    script_histogram,
+)
+
+
+def test_histogram_ignores_digits_punctuation_and_spaces():
+    counts = script_histogram("Hb 14.2 g/dL — हीमोग्लोबिन")
+    assert counts["Latin"] == 5
+    assert counts["Devanagari"] > 0
+    assert sum(counts.values()) == counts["Latin"] + counts["Devanagari"]
+
+
+def test_detects_single_script_languages():
+    assert guess_language_code("This is a government notice regarding land ownership.") == "en-IN"
+    assert guess_language_code("இது நில உரிமை தொடர்பான அரசு அறிவிப்பு ஆகும்") == "ta-IN"
+    assert guess_language_code("ఇది భూమి యాజమాన్యానికి సంబంధించిన ప్రభుత్వ నోటీసు") == "te-IN"
+    assert guess_language_code("এটি জমির মালিকানা সংক্রান্ত একটি সরকারি নোটিশ") == "bn-IN"
+
+
+def test_latin_text_is_english_only_when_it_reads_as_english():
+    assert guess_language_code("Please pay the amount due before the end of this month.") == "en-IN"
+    # Romanized Hindi and French are Latin script but not English: leave them to "auto"
+    assert guess_language_code("Aapka bijli bill abhi tak pending hai, kripya jaldi bharein") is None
+    assert guess_language_code("Votre facture d'électricité est toujours impayée") is None
+    assert guess_tesseract_lang("Aapka bijli bill abhi tak pending hai") == "eng"
+
+
+def test_separates_hindi_and_marathi_by_function_words():
+    assert guess_language_code("यह भूमि स्वामित्व के बारे में एक सरकारी सूचना है और सभी को पढ़ना है") == "hi-IN"
+    assert guess_language_code("ही जमीन मालकी बद्दलची सरकारी सूचना आहे आणि सर्वांनी वाचणे आवश्यक आहे") == "mr-IN"
+    # Devanagari without telling words stays undecided
+    assert guess_language_code("सरकारी सूचना भूमि स्वामित्व") is None
+
+
+def test_mixed_or_short_text_is_undecided():
+    assert detect_script("OK") is None
+    assert guess_language_code("Blood sugar रक्त शर्करा high उच्च level स्तर") is None
+
+
+def test_tesseract_lang_from_text():
+    assert guess_tesseract_lang("ಇದು ಭೂ ಮಾಲೀಕತ್ವದ ಕುರಿತು ಸರ್ಕಾರಿ ಸೂಚನೆ") == "kan"
+    assert guess_tesseract_lang("Plain English paragraph of text") == "eng"
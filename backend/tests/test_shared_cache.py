@@ -0,0 +1,82 @@
+import multiprocessing
+import time
+
+from app.utils.lru import LRUCache
+from app.utils.shared_cache import SQLiteCache, memoize
+
+
+def _write_from_child(path: str) -> None:
+    SQLiteCache(path).set("child", {"text": "नमस्ते", "n": 1})
+
+
+def test_values_are_shared_between_processes(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = SQLiteCache(path)
+    child = multiprocessing.get_context("spawn").Process(target=_write_from_child, args=(path,))
+    child.start()
+    child.join(30)
+
+    assert child.exitcode == 0
+    assert cache.get("child") == {"text": "नमस्ते", "n": 1}
+
+
+def test_tables_are_independent_and_expire(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    results = SQLiteCache(path, table="results", ttl=0.05)
+    memory = SQLiteCache(path, table="translation_memory")
+    results.set("key", "a")
+    memory.set("key", "b")
+
+    assert results.get("key") == "a"
+    assert memory.get("key") == "b"
+    time.sleep(0.1)
+    assert results.get("key", "missing") == "missing"
+    assert memory.get("key") == "b"
+
+
+def test_prune_keeps_most_recent_entries(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"), max_entries=3, prune_every=5)
+    for i in range(5):
+        cache.set(f"k{i}", i)
+
+    assert len(cache) == 3
+    assert cache.get("k0") is None
+    assert cache.get("k4") == 4
+
+
+def test_lru_ttl():
+    cache = LRUCache(2, ttl=0.05)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.1)
+    assert cache.get("a") is None
+
+
+def test_memoize_reuses_results_by_bound_arguments(tmp_path):
+    calls = []
+
+    @memoize(SQLiteCache(str(tmp_path / "cache.sqlite")), "test.analyze")
+    def analyze(text: str, audience: str = "general") -> dict:
+        calls.append(text)
+        return {"text": text, "audience": audience}
+
+    first = analyze("notice")
+    first["audience"] = "changed"
+    second = analyze(text="notice", audience="general")
+
+    assert calls == ["notice"]
+    assert second == {"text": "notice", "audience": "general"}
+
+
+def test_memoize_skips_results_rejected_by_cache_if():
+    calls = []
+
+    @memoize(LRUCache(8), "test.analyze", cache_if=lambda result: "error" not in result)
+    def analyze(text: str) -> dict:
+        calls.append(text)
+        return {"error": "Failed to parse LLM output"} if len(calls) == 1 else {"type": "general"}
+
+    assert analyze("notice") == {"error": "Failed to parse LLM output"}
+    assert analyze("notice") == {"type": "general"}
+    assert analyze("notice") == {"type": "general"}
+    assert calls == ["notice", "notice"]
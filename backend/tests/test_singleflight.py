@@ -0,0 +1,74 @@
+import threading
+import time
+
+import pytest
+
+from app.utils.metrics import SINGLEFLIGHT_COALESCED
+from app.utils.singleflight import SingleFlight, coalesce
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    group = SingleFlight()
+    calls = []
+    coalesced_before = SINGLEFLIGHT_COALESCED.labels().get()
+
+    @coalesce("test.echo", group=group)
+    def echo(text: str, suffix: str = "!") -> dict:
+        calls.append(text)
+        time.sleep(0.2)
+        return {"text": text + suffix}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(echo("hi"))),
+        threading.Thread(target=lambda: results.append(echo(text="hi", suffix="!"))),
+        threading.Thread(target=lambda: results.append(echo("hi", "!"))),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["hi"]
+    assert results == [{"text": "hi!"}] * 3
+    # Followers receive copies, not the leader's object
+    assert len({id(result) for result in results}) == 3
+    assert group.in_flight() == 0
+    assert SINGLEFLIGHT_COALESCED.labels().get() - coalesced_before == 2
+
+
+def test_errors_propagate_to_all_waiters():
+    group = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("upstream down")
+
+    errors = []
+
+    def run():
+        try:
+            group.do("key", fail)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=run)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=run)
+    follower.start()
+    leader.join()
+    follower.join()
+
+    assert errors == ["upstream down", "upstream down"]
+
+
+def test_sequential_calls_are_not_cached():
+    group = SingleFlight()
+    counter = iter(range(10))
+    assert group.do("k", lambda: next(counter)) == (0, False)
+    assert group.do("k", lambda: next(counter)) == (1, False)
+    with pytest.raises(StopIteration):
+        group.do("k", lambda: next(iter(())))
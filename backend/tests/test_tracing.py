@@ -0,0 +1,16 @@
+import ipaddress
+
+from app.utils.tracing import client_address
+
+PROXIES = (ipaddress.ip_network("10.0.0.0/8"),)
+
+
+def test_client_address_reads_forwarded_for_only_from_trusted_proxies():
+    # Direct connection: the header is the caller's to forge
+    assert client_address("203.0.113.7", "198.51.100.1", PROXIES) == "203.0.113.7"
+    # Behind the load balancer: the rightmost hop it did not add
+    assert client_address("10.0.0.5", "198.51.100.1, 203.0.113.7", PROXIES) == "203.0.113.7"
+    # Through two trusted hops
+    assert client_address("10.0.0.5", "203.0.113.7, 10.1.2.3", PROXIES) == "203.0.113.7"
+    assert client_address("10.0.0.5", None, PROXIES) == "10.0.0.5"
+    assert client_address(None, "203.0.113.7") == "anonymous"
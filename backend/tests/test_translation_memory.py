@@ -0,0 +1,84 @@
+from app.services.translation_memory import TranslationMemory, segment
+
+
+class FakeTranslator:
+    """Upper-cases text and writes digits in Devanagari, like a real translator might."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text: str, source: str) -> str:
+        self.calls.append(text)
+        return text.upper().translate(str.maketrans("0123456789", "०१२३४५६७८९"))
+
+
+def test_segment_round_trips_text():
+    text = "Name: Ravi. Amount due: 1,200 rupees!\nPay by 15 March। धन्यवाद"
+    pairs = segment(text)
+    assert [seg for seg, _ in pairs] == ["Name: Ravi.", "Amount due: 1,200 rupees!", "Pay by 15 March।", "धन्यवाद"]
+    assert "".join(seg + sep for seg, sep in pairs) == text
+
+
+def test_segment_does_not_split_after_abbreviations():
+    text = "Dear Mr. Sharma, Rs. 1,200 is due on 12.03.2024. Ref No. 45 applies, i.e. in full. Dr. A.K. Rao signed."
+    pairs = segment(text)
+    assert [seg for seg, _ in pairs] == [
+        "Dear Mr. Sharma, Rs. 1,200 is due on 12.03.2024.",
+        "Ref No. 45 applies, i.e. in full.",
+        "Dr. A.K. Rao signed.",
+    ]
+    assert "".join(seg + sep for seg, sep in pairs) == text
+
+
+def test_exact_segments_are_served_from_memory():
+    memory = TranslationMemory()
+    translate = FakeTranslator()
+
+    first = memory.translate("Hello there. Pay at the office.", "en-IN", "hi-IN", translate)
+    second = memory.translate("Pay at the office. Hello there.", "en-IN", "hi-IN", translate)
+
+    assert first == "HELLO THERE. PAY AT THE OFFICE."
+    assert second == "PAY AT THE OFFICE. HELLO THERE."
+    assert translate.calls == ["Hello there.\nPay at the office."]
+
+
+def test_numeric_only_differences_reuse_translation_with_numbers_swapped():
+    memory = TranslationMemory()
+    translate = FakeTranslator()
+
+    memory.translate("Amount due: 1,200 rupees by day 15.", "en-IN", "hi-IN", translate)
+    result = memory.translate("Amount due: 3,450 rupees by day 28.", "en-IN", "hi-IN", translate)
+
+    assert result == "AMOUNT DUE: ३,४५० RUPEES BY DAY २८."
+    assert len(translate.calls) == 1
+
+
+def test_only_new_segments_are_sent():
+    memory = TranslationMemory()
+    translate = FakeTranslator()
+
+    memory.translate("Form A. Signed by clerk.", "en-IN", "hi-IN", translate)
+    result = memory.translate("Form A. Stamped by officer. Signed by clerk.", "en-IN", "hi-IN", translate)
+
+    assert result == "FORM A. STAMPED BY OFFICER. SIGNED BY CLERK."
+    assert translate.calls[-1] == "Stamped by officer."
+
+
+def test_ambiguous_numbers_are_not_templated():
+    memory = TranslationMemory()
+    translate = FakeTranslator()
+
+    memory.translate("Room 5 on floor 5.", "en-IN", "hi-IN", translate)
+    memory.translate("Room 6 on floor 7.", "en-IN", "hi-IN", translate)
+
+    assert len(translate.calls) == 2
+
+
+def test_languages_are_kept_apart():
+    memory = TranslationMemory()
+    translate = FakeTranslator()
+
+    memory.translate("Hello there.", "en-IN", "hi-IN", translate)
+    memory.translate("Hello there.", "en-IN", "ta-IN", translate)
+
+    assert len(translate.calls) == 2
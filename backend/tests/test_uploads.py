@@ -0,0 +1,94 @@
+import hashlib
+import io
+import os
+import threading
+import time
+
+import pytest
+
+from app.utils.uploads import (
+    AUDIO_KINDS,
+    DOCUMENT_KINDS,
+    MemoryBudget,
+    UnsupportedUpload,
+    UploadBackpressure,
+    UploadTooLarge,
+    save_upload,
+    sniff_kind,
+)
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+def test_sniff_kind_uses_magic_bytes():
+    assert sniff_kind(b"%PDF-1.7") == "pdf"
+    assert sniff_kind(PNG_HEADER) == "png"
+    assert sniff_kind(b"\xff\xd8\xff\xe0") == "jpeg"
+    assert sniff_kind(b"RIFF\x00\x00\x00\x00WAVEfmt ") == "wav"
+    assert sniff_kind(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "webp"
+    assert sniff_kind(b"\x1a\x45\xdf\xa3\x9f\x42\x86\x81\x01") == "webm"
+    assert sniff_kind(b"\x00\x00\x00\x20ftypM4A \x00\x00\x00\x00") == "m4a"
+    assert sniff_kind(b"\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00") == "mp4"
+    assert sniff_kind(b"plain text") is None
+
+
+def test_save_upload_accepts_recorder_webm_as_audio():
+    upload = save_upload(io.BytesIO(b"\x1a\x45\xdf\xa3\x9f\x42\x86\x81\x01webm-opus"), AUDIO_KINDS, max_bytes=1024)
+    try:
+        assert upload.kind == "webm"
+        assert upload.path.endswith(".webm")
+    finally:
+        upload.remove()
+
+
+def test_save_upload_streams_and_hashes_in_blocks():
+    payload = PNG_HEADER + os.urandom(10_000)
+    upload = save_upload(io.BytesIO(payload), DOCUMENT_KINDS, max_bytes=20_000, block_size=1024)
+    try:
+        assert upload.kind == "png"
+        assert upload.size == len(payload)
+        assert upload.sha256 == hashlib.sha256(payload).hexdigest()
+        assert upload.path.endswith(".png")
+        with open(upload.path, "rb") as saved:
+            assert saved.read() == payload
+    finally:
+        upload.remove()
+
+
+def test_save_upload_rejects_oversized_and_cleans_up(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    payload = b"%PDF-" + b"x" * 5000
+    with pytest.raises(UploadTooLarge):
+        save_upload(io.BytesIO(payload), DOCUMENT_KINDS, max_bytes=4096, block_size=1024)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_save_upload_rejects_wrong_content():
+    with pytest.raises(UnsupportedUpload):
+        save_upload(io.BytesIO(PNG_HEADER + b"data"), AUDIO_KINDS, max_bytes=1024)
+    with pytest.raises(UnsupportedUpload):
+        save_upload(io.BytesIO(b""), DOCUMENT_KINDS, max_bytes=1024)
+
+
+def test_memory_budget_backpressures_until_released():
+    budget = MemoryBudget(limit_bytes=100)
+    with budget.reserve(80, timeout=1):
+        with pytest.raises(UploadBackpressure):
+            with budget.reserve(30, timeout=0.05):
+                pass
+
+    released = threading.Event()
+
+    def hold():
+        with budget.reserve(80, timeout=1):
+            released.wait(1)
+            time.sleep(0.05)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    time.sleep(0.02)
+    released.set()
+    with budget.reserve(30, timeout=1):
+        assert budget.used == 30
+    holder.join()
+    assert budget.used == 0